@@ -1,37 +1,36 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
 import discord
 from discord.ext import commands, tasks
 import os
-import traceback
-from flask import Flask
 import sys
-import aiohttp
 import asyncio
-from dotenv import load_dotenv
+import hashlib
+import json
+import logging
+from utils.http import create_session
+from utils.metrics import monitor_loop_lag
+from utils.tracing import setup_logging
 
-# Initialize environment variables
-load_dotenv()
+log = logging.getLogger(__name__)
 
-# Flask Setup
-app = Flask(__name__)
-bot_name = "Loading..."
+COMMAND_TREE_FINGERPRINT = ".command_tree.sha256"
 
-@app.route('/')
-def home():
-    """Health check endpoint for Render"""
-    return f"Bot {bot_name} is operational"
 
-def run_flask():
-    """Run Flask with Render-compatible settings"""
-    port = int(os.environ.get("PORT", 10000))
-    app.run(host='0.0.0.0', port=port)
+def get_token():
+    """Load environment variables and return the bot token"""
+    from dotenv import load_dotenv
+    load_dotenv()
 
-# Discord Bot Setup
-TOKEN = os.getenv("TOKEN")
-if not TOKEN:
-    raise ValueError("Missing TOKEN in environment")
+    token = os.getenv("TOKEN")
+    if not token:
+        raise ValueError("Missing TOKEN in environment")
+    return token
 
-class Bot(commands.Bot):
-    def __init__(self):
+class Bot(commands.AutoShardedBot):
+    def __init__(self, shard_ids=None, shard_count=None, cluster_id=None):
         # Configure minimal required intents
         intents = discord.Intents.default()
         intents.message_content = True
@@ -39,51 +38,134 @@ class Bot(commands.Bot):
         super().__init__(
             command_prefix="!",
             intents=intents,
-            help_command=None
+            help_command=None,
+            shard_ids=shard_ids,
+            shard_count=shard_count
         )
+        # Set by cluster.py when running as one of several processes
+        self.cluster_id = cluster_id
+        shared_cache_path = os.environ.get("SHARED_CACHE_PATH")
+        if shared_cache_path:
+            from utils.shared_cache import SharedCache
+            self.shared_cache = SharedCache(shared_cache_path)
+        else:
+            self.shared_cache = None
+        self.startup_marks = []
+        self.first_command_served = False
         self.session = None
+        self.pool_stats = None
+        self.lag_monitor = None
+        self.health_server = None
+
+    def _mark(self, label):
+        self.startup_marks.append((label, time.perf_counter()))
 
     async def setup_hook(self):
         """Initialize bot components"""
-        self.session = aiohttp.ClientSession()
+        self._mark("login")
+        # One shared, tuned connection pool for the bot and every cog
+        self.session, self.pool_stats = create_session()
+        self.lag_monitor = asyncio.create_task(monitor_loop_lag())
+        self._mark("http session")
+
+        # Start the health server if running on Render (first cluster only)
+        if os.environ.get('RENDER') and not self.cluster_id:
+            from utils.health_server import HealthServer
+            self.health_server = HealthServer(
+                self,
+                port=int(os.environ.get("PORT", 10000)),
+                max_loop_lag=float(os.environ.get("MAX_LOOP_LAG", 1.0))
+            )
+            await self.health_server.start()
+            log.info("Health server started")
+            self._mark("health server")
         
         # Load cogs
         try:
             await self.load_extension("cogs.infoCommands")
-            print("✅ Successfully loaded InfoCommands cog")
+            log.info("Successfully loaded InfoCommands cog")
         except Exception as e:
-            print(f"❌ Failed to load cog: {e}")
-            traceback.print_exc()
-        
-        await self.tree.sync()
+            log.exception("Failed to load cog: %s", e)
+        self._mark("cogs")
+
+        # Only one cluster needs to sync the global command tree
+        if not self.cluster_id:
+            await self.sync_command_tree()
+            self._mark("command tree")
         self.update_status.start()
 
+        previous = STARTED_AT
+        breakdown = []
+        for label, at in self.startup_marks:
+            breakdown.append(f"{label} {at - previous:.3f}s")
+            previous = at
+        log.info("Startup: %s | total %.3fs", " | ".join(breakdown), previous - STARTED_AT)
+
+    def command_tree_fingerprint(self):
+        """Hash of the application command payloads Discord would receive on sync"""
+        payloads = []
+        for command in self.tree.get_commands():
+            try:
+                payloads.append(command.to_dict(self.tree))
+            except TypeError:
+                # discord.py < 2.4 takes no tree argument
+                payloads.append(command.to_dict())
+        payload = json.dumps([self.application_id, payloads], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def sync_command_tree(self):
+        """Sync application commands only when their definitions changed"""
+        path = os.environ.get("COMMAND_TREE_FINGERPRINT", COMMAND_TREE_FINGERPRINT)
+        fingerprint = self.command_tree_fingerprint()
+        try:
+            with open(path, 'r') as f:
+                if f.read().strip() == fingerprint:
+                    log.info("Command tree unchanged, skipping sync")
+                    return
+        except OSError:
+            pass
+
+        await self.tree.sync()
+        try:
+            with open(path + ".tmp", 'w') as f:
+                f.write(fingerprint)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            log.warning("Could not store command tree fingerprint: %s", e)
+        log.info("Command tree synced")
+
     async def on_ready(self):
         """When bot connects to Discord"""
-        global bot_name
-        bot_name = str(self.user)
-        
-        print(f"\n🔗 Connected as {bot_name}")
-        print(f"🌐 Serving {len(self.guilds)} servers")
-        
-        # Start Flask if running on Render
-        if os.environ.get('RENDER'):
-            import threading
-            flask_thread = threading.Thread(target=run_flask, daemon=True)
-            flask_thread.start()
-            print("🚀 Flask server started in background")
+        log.info("Connected as %s", self.user)
+        log.info("Serving %d servers", len(self.guilds))
+        log.info("Ready %.3fs after start", time.perf_counter() - STARTED_AT)
+
+    def _log_first_command(self):
+        if not self.first_command_served:
+            self.first_command_served = True
+            log.info("First command served %.3fs after start", time.perf_counter() - STARTED_AT)
+
+    async def on_command_completion(self, ctx):
+        self._log_first_command()
+
+    async def on_app_command_completion(self, interaction, command):
+        self._log_first_command()
 
     @tasks.loop(minutes=5)
     async def update_status(self):
         """Update bot presence periodically"""
         try:
+            guild_count = len(self.guilds)
+            if self.shared_cache and self.cluster_id is not None:
+                await asyncio.to_thread(self.shared_cache.report_guilds, self.cluster_id, guild_count)
+                guild_count = await asyncio.to_thread(self.shared_cache.total_guilds)
             activity = discord.Activity(
                 type=discord.ActivityType.watching,
-                name=f"{len(self.guilds)} servers"
+                name=f"{guild_count} servers"
             )
             await self.change_presence(activity=activity)
         except Exception as e:
-            print(f"⚠️ Status update failed: {e}")
+            log.warning("Status update failed: %s", e)
 
     @update_status.before_loop
     async def before_status_update(self):
@@ -91,25 +173,32 @@ class Bot(commands.Bot):
 
     async def close(self):
         """Cleanup on shutdown"""
+        if self.lag_monitor:
+            self.lag_monitor.cancel()
+        if self.health_server:
+            await self.health_server.stop()
         if self.session:
             await self.session.close()
+        if self.shared_cache:
+            self.shared_cache.close()
         await super().close()
 
 async def main():
+    token = get_token()
     bot = Bot()
     try:
-        await bot.start(TOKEN)
+        await bot.start(token)
     except KeyboardInterrupt:
         await bot.close()
     except Exception as e:
-        print(f"⚠️ Critical error: {e}")
-        traceback.print_exc()
+        log.exception("Critical error: %s", e)
         await bot.close()
 
 if __name__ == "__main__":
     # Special handling for Render's environment
+    setup_logging()
     if os.environ.get('RENDER'):
         asyncio.run(main())
     else:
         bot = Bot()
-        bot.run(TOKEN)
\ No newline at end of file
+        bot.run(get_token(), log_handler=None)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Minimal stand-ins for the discord.py objects the info commands touch."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+
+class FakeMessage:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def edit(self, **kwargs):
+        await self.ctx._record("edit", None, kwargs)
+        return self
+
+
+class _Typing:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def __aenter__(self):
+        # Entering typing is a round trip to Discord (a typing trigger or an interaction defer)
+        await self.ctx._round_trip()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeContext:
+    """Records every send, reply and edit instead of talking to Discord."""
+
+    def __init__(self, guild_id, channel_id, author_id, send_latency=0.0):
+        self.guild = SimpleNamespace(id=guild_id, get_channel=lambda channel_id: None)
+        self.channel = SimpleNamespace(id=channel_id)
+        self.author = SimpleNamespace(
+            id=author_id,
+            mention=f"<@{author_id}>",
+            display_avatar=SimpleNamespace(url="https://cdn.discordapp.com/embed/avatars/0.png")
+        )
+        self.interaction = None
+        self.send_latency = send_latency
+        self.created_at = time.perf_counter()
+        self.first_send_at = None
+        self.events = []
+
+    async def _round_trip(self):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+
+    async def _record(self, kind, content, kwargs):
+        await self._round_trip()
+        files = list(kwargs.get("files") or []) + list(kwargs.get("attachments") or [])
+        if kwargs.get("file"):
+            files.append(kwargs["file"])
+        for file in files:
+            file.close()
+        now = time.perf_counter()
+        if self.first_send_at is None:
+            self.first_send_at = now
+        self.events.append({
+            "kind": kind,
+            "at": now - self.created_at,
+            "content": content,
+            "embed": kwargs.get("embed") is not None,
+            "attachments": len(files)
+        })
+
+    async def send(self, content=None, **kwargs):
+        await self._record("send", content, kwargs)
+        return FakeMessage(self)
+
+    async def reply(self, content=None, **kwargs):
+        await self._record("reply", content, kwargs)
+        return FakeMessage(self)
+
+    async def defer(self, **kwargs):
+        await self._round_trip()
+
+    def typing(self):
+        return _Typing(self)
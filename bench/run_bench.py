@@ -0,0 +1,203 @@
+"""Offline load test for the info command path.
+
+Runs the real ``InfoCommands`` cog against local stub upstreams with a fake
+``commands.Context`` and writes latency, throughput, upstream call counts and
+peak RSS to a JSON file so runs can be compared. No network access is needed.
+
+    python -m bench.run_bench --lookups 5000 --concurrency 300 --output bench_results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import socket
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bench.fake_context import FakeContext  # noqa: E402
+from bench.stub_servers import serve  # noqa: E402
+from utils.tracing import setup_logging  # noqa: E402
+
+GUILD_ID = 100000000000000001
+CHANNEL_ID = 200000000000000001
+
+
+class FakeBot:
+    def __init__(self, session, pool_stats):
+        self.session = session
+        self.pool_stats = pool_stats
+        self.shared_cache = None
+        self._ready = asyncio.Event()
+
+    async def wait_until_ready(self):
+        # Never "ready", so background loops such as prefetch stay idle during a run
+        await self._ready.wait()
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def summarize(values):
+    return {
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None
+    }
+
+
+def zipf_uids(count, distinct, skew, seed):
+    """Draw ``count`` UIDs where the k-th most popular UID has weight 1 / k**skew."""
+    rng = random.Random(seed)
+    population = [str(10_000_000 + rank) for rank in range(distinct)]
+    weights = [1 / (rank + 1) ** skew for rank in range(distinct)]
+    return rng.choices(population, weights=weights, k=count)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_stubs(session, base_url, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with session.get(f"{base_url}/__stats") as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError("stub servers did not start")
+        await asyncio.sleep(0.1)
+
+
+async def run(args, base_url):
+    from cogs.infoCommands import InfoCommands
+    from utils.http import create_session
+
+    session, pool_stats = create_session()
+    try:
+        await wait_for_stubs(session, base_url)
+        cog = InfoCommands(FakeBot(session, pool_stats))
+        cog.api_url = f"{base_url}/info"
+        cog.profile_card_url = f"{base_url}/card"
+        cog.generate_url = f"{base_url}/outfit"
+        await cog.cog_load()
+        # Measure the lookup path, not the rate limiter
+        cog.config.global_settings["default_cooldown"] = 0
+        cog.config.set_guild_setting(str(GUILD_ID), "subscribed", True)
+
+        uids = zipf_uids(args.lookups, args.distinct_uids, args.zipf, args.seed)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+        first_response = []
+        sends = 0
+
+        async def lookup(index, uid):
+            nonlocal sends
+            async with semaphore:
+                ctx = FakeContext(GUILD_ID, CHANNEL_ID, author_id=index, send_latency=args.send_latency)
+                start = time.perf_counter()
+                await cog.player_info.callback(cog, ctx, uid)
+                latencies.append(time.perf_counter() - start)
+                if ctx.first_send_at is not None:
+                    first_response.append(ctx.first_send_at - start)
+                sends += len(ctx.events)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(lookup(index, uid) for index, uid in enumerate(uids)))
+        elapsed = time.perf_counter() - started
+        await cog.cog_unload()
+
+        async with session.get(f"{base_url}/__stats") as response:
+            upstream_calls = await response.json()
+
+        return {
+            "lookups": len(uids),
+            "elapsed_s": elapsed,
+            "throughput_per_s": len(uids) / elapsed,
+            "latency_s": summarize(latencies),
+            "first_response_s": summarize(first_response),
+            "discord_calls": sends,
+            "upstream_calls": upstream_calls,
+            "info_cache": cog.info_cache.stats(),
+            "image_cache": cog.image_store.stats(),
+            "coalescing": cog.flights.stats(),
+            "http_pool": pool_stats.stats()
+        }
+    finally:
+        await session.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--distinct-uids", type=int, default=500)
+    parser.add_argument("--zipf", type=float, default=1.1, help="popularity skew of the UID distribution")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--info-latency", type=float, default=0.08)
+    parser.add_argument("--card-latency", type=float, default=0.30)
+    parser.add_argument("--outfit-latency", type=float, default=0.25)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--info-size", type=int, default=4_000)
+    parser.add_argument("--image-size", type=int, default=200_000)
+    parser.add_argument("--send-latency", type=float, default=0.05, help="simulated Discord API latency")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--verbose", action="store_true", help="show the cog's log output, including slow-request traces")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Slow-request traces are expected under load, so only errors are shown by default
+    setup_logging(logging.INFO if args.verbose else logging.ERROR)
+    output = os.path.abspath(args.output)
+    stub_config = {
+        "info": {"latency": args.info_latency, "jitter": args.jitter, "error_rate": args.error_rate, "payload_size": args.info_size},
+        "card": {"latency": args.card_latency, "jitter": args.jitter, "error_rate": args.error_rate, "payload_size": args.image_size},
+        "outfit": {"latency": args.outfit_latency, "jitter": args.jitter, "error_rate": args.error_rate, "payload_size": args.image_size}
+    }
+
+    port = free_port()
+    server = multiprocessing.get_context("spawn").Process(target=serve, args=(port, stub_config), daemon=True)
+    server.start()
+    # Config, quota and image caches are created in a throwaway directory
+    os.chdir(tempfile.mkdtemp(prefix="ffbench-"))
+    try:
+        results = asyncio.run(run(args, f"http://127.0.0.1:{port}"))
+    finally:
+        server.terminate()
+        server.join()
+
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    results["args"] = vars(args)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+
+    latency = results["latency_s"]
+    print(f"{results['lookups']} lookups in {results['elapsed_s']:.2f}s ({results['throughput_per_s']:.1f}/s)")
+    print(f"latency p50={latency['p50']:.3f}s p95={latency['p95']:.3f}s p99={latency['p99']:.3f}s")
+    print(f"upstream calls: {results['upstream_calls']}")
+    print(f"peak RSS: {results['peak_rss_mb']:.1f} MB, results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Local stand-ins for the info, profile-card and outfit endpoints."""
+import asyncio
+import json
+import random
+import struct
+import zlib
+
+from aiohttp import web
+
+
+def make_png(size_bytes, seed=0):
+    """Return a valid RGB PNG of roughly ``size_bytes`` (random pixels do not compress)."""
+    side = max(1, int((size_bytes / 3) ** 0.5))
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(side * 3) for _ in range(side))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def make_info(uid, size_bytes):
+    payload = {
+        "basicInfo": {
+            "nickname": f"Player{uid[-4:]}", "level": 65, "exp": 2500000, "region": "SG",
+            "liked": 12000, "releaseVersion": "OB46", "badgeCnt": 120, "showBrRank": True,
+            "rankingPoints": 3200, "showCsRank": True, "csRankingPoints": 60,
+            "createAt": "1580000000", "lastLoginAt": "1720000000", "bannerId": 901000001
+        },
+        "captainBasicInfo": {
+            "nickname": "Leader", "accountId": "123456789", "level": 70, "exp": 3000000,
+            "lastLoginAt": "1720000000", "title": 904090014, "badgeCnt": 99,
+            "showBrRank": True, "rankingPoints": 4000, "showCsRank": False, "csRankingPoints": 10
+        },
+        "clanBasicInfo": {"clanName": "Bench", "clanId": "3000000001", "clanLevel": 5, "memberNum": 40, "capacity": 50},
+        "creditScoreInfo": {"creditScore": 100},
+        "petInfo": {"isSelected": True, "name": "Falco", "exp": 6000, "level": 7},
+        "profileInfo": {"avatarId": 902000001, "equipedSkills": [16, 1, 26, 1]},
+        "socialInfo": {"signature": ""}
+    }
+    padding = size_bytes - len(json.dumps(payload))
+    if padding > 0:
+        payload["socialInfo"]["signature"] = "x" * padding
+    return payload
+
+
+class StubUpstream:
+    """One stub endpoint with configurable latency, error rate and payload size."""
+
+    def __init__(self, name, latency=0.05, jitter=0.02, error_rate=0.0, payload_size=50_000):
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.payload_size = payload_size
+        self.calls = 0
+        self.errors = 0
+        self._pngs = {}
+
+    async def handle(self, request):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(status=500, text="stub error")
+
+        uid = request.query.get("uid", "0")
+        if self.name == "info":
+            return web.json_response(make_info(uid, self.payload_size))
+        # Every UID gets its own image so dedup, compositing and eviction see distinct blobs
+        png = self._pngs.get(uid)
+        if png is None:
+            png = self._pngs[uid] = make_png(self.payload_size, seed=zlib.crc32(f"{self.name}:{uid}".encode()))
+        return web.Response(body=png, content_type="image/png")
+
+
+def build_app(upstreams):
+    app = web.Application()
+    for upstream in upstreams.values():
+        app.router.add_get(f"/{upstream.name}", upstream.handle)
+
+    async def stats(request):
+        return web.json_response({
+            name: {"calls": upstream.calls, "errors": upstream.errors}
+            for name, upstream in upstreams.items()
+        })
+
+    app.router.add_get("/__stats", stats)
+    return app
+
+
+def serve(port, config):
+    """Process entry point: serve every stub endpoint on ``port`` until terminated."""
+    upstreams = {name: StubUpstream(name, **options) for name, options in config.items()}
+    web.run_app(build_app(upstreams), host="127.0.0.1", port=port, print=None, access_log=None)
@@ -0,0 +1,105 @@
+import logging
+import math
+import multiprocessing
+import os
+import signal
+import time
+
+from dotenv import load_dotenv
+
+from utils.tracing import setup_logging
+
+log = logging.getLogger(__name__)
+
+
+def shard_ranges(shard_count, cluster_count):
+    """Split ``range(shard_count)`` into contiguous ranges, one per cluster."""
+    per_cluster = math.ceil(shard_count / cluster_count)
+    return [
+        list(range(start, min(start + per_cluster, shard_count)))
+        for start in range(0, shard_count, per_cluster)
+    ]
+
+
+def run_worker(cluster_id, shard_ids, shard_count):
+    """Process entry point: run one bot that owns ``shard_ids``."""
+    # The on-disk image index is per process, so each cluster gets its own directory
+    image_dir = os.environ.get("IMAGE_CACHE_DIR", "image_cache")
+    os.environ["IMAGE_CACHE_DIR"] = os.path.join(image_dir, f"cluster-{cluster_id}")
+
+    from app import Bot, get_token
+    setup_logging()
+    bot = Bot(shard_ids=shard_ids, shard_count=shard_count, cluster_id=cluster_id)
+    bot.run(get_token(), log_handler=None)
+
+
+class ClusterLauncher:
+    """Start one process per shard range and restart any that exit."""
+
+    def __init__(self, cluster_count, shard_count):
+        self.shard_count = shard_count
+        self.ranges = shard_ranges(shard_count, cluster_count)
+        self.context = multiprocessing.get_context("spawn")
+        self.processes = {}
+        self.started_at = {}
+        self.restart_at = {}
+        self.failures = {}
+        self.stopping = False
+
+    def _spawn(self, cluster_id):
+        process = self.context.Process(
+            target=run_worker,
+            args=(cluster_id, self.ranges[cluster_id], self.shard_count),
+            name=f"cluster-{cluster_id}"
+        )
+        process.start()
+        self.processes[cluster_id] = process
+        self.started_at[cluster_id] = time.monotonic()
+        self.restart_at.pop(cluster_id, None)
+        log.info("Cluster %s started with shards %s (pid %s)", cluster_id, self.ranges[cluster_id], process.pid)
+
+    def _stop(self, *_):
+        self.stopping = True
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        for cluster_id in range(len(self.ranges)):
+            self._spawn(cluster_id)
+
+        while not self.stopping:
+            time.sleep(1)
+            now = time.monotonic()
+            for cluster_id, process in list(self.processes.items()):
+                if process.is_alive():
+                    continue
+                if cluster_id not in self.restart_at:
+                    # Back off on crash loops, but forgive a worker that ran for a while
+                    if now - self.started_at[cluster_id] > 60:
+                        self.failures[cluster_id] = 0
+                    self.failures[cluster_id] = self.failures.get(cluster_id, 0) + 1
+                    delay = min(60, 2 ** self.failures[cluster_id])
+                    self.restart_at[cluster_id] = now + delay
+                    log.warning("Cluster %s exited with code %s, restarting in %ss", cluster_id, process.exitcode, delay)
+                elif now >= self.restart_at[cluster_id]:
+                    self._spawn(cluster_id)
+
+        self.shutdown()
+
+    def shutdown(self):
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    setup_logging()
+    cluster_count = int(os.environ.get("CLUSTER_COUNT", 2))
+    shard_count = int(os.environ.get("SHARD_COUNT", cluster_count))
+    os.environ.setdefault("SHARED_CACHE_PATH", os.path.join("cache", "cluster.db"))
+    ClusterLauncher(cluster_count, shard_count).run()
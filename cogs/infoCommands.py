@@ -1,17 +1,36 @@
 import discord
-from discord.ext import commands
-from discord import app_commands
 import aiohttp
+from discord.ext import commands, tasks
+from discord import app_commands
 from datetime import datetime
-import json
 import os
 import asyncio
-import io
 import uuid
-import gc
+import math
+import logging
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from utils.cache import TTLCache
+from utils.singleflight import SingleFlight
+from utils.popularity import PopularityTracker
+from utils.tracing import Tracer, traced
+from utils.image_store import ImageStore, ImageRejected
+from utils.imaging import PIL_AVAILABLE, composite_images, image_extension
+from utils.resilience import Upstream, CircuitOpenError
+from utils.http import request_timeout
+from utils.config_store import SQLiteConfigStore
+from utils.ratelimit import RateLimiter
+from utils.metrics import (
+    UPSTREAM_LATENCY, DISCORD_SEND_LATENCY, LOOKUPS, COOLDOWN_REJECTIONS, QUOTA_REJECTIONS,
+    IMAGE_BYTES, IMAGE_DOWNLOADS_IN_FLIGHT, IMAGE_REJECTIONS
+)
+
+log = logging.getLogger(__name__)
 
 CONFIG_FILE = "info_channels.json"
+CONFIG_DB = "info_channels.db"
 
 
 class InfoCommands(commands.Cog):
@@ -20,9 +39,69 @@ class InfoCommands(commands.Cog):
         self.api_url = "https://info.khushi.qzz.io/info"
         self.generate_url = "https://profile.thug4ff.com/api/profile"
         self.profile_card_url = "https://profile-card-xi-henna.vercel.app/api/profile"
-        self.session = aiohttp.ClientSession()
-        self.config_data = self.load_config()
-        self.cooldowns = {}
+        self.info_timeout = 10
+        self.card_timeout = 8
+        self.outfit_timeout = 8
+        self.upstreams = {
+            "info": Upstream(
+                "info", floor=2.0, ceiling=self.info_timeout,
+                hedge=os.environ.get("INFO_HEDGE", "0") == "1",
+                is_failure=lambda result: result[0] >= 500,
+                on_change=self._on_breaker_change
+            ),
+            "card": Upstream(
+                "card", floor=1.0, ceiling=self.card_timeout,
+                is_failure=lambda result: result[0] >= 500,
+                on_change=self._on_breaker_change
+            ),
+            "outfit": Upstream(
+                "outfit", floor=1.0, ceiling=self.outfit_timeout,
+                is_failure=lambda result: result[0] >= 500,
+                on_change=self._on_breaker_change
+            )
+        }
+        self.session = bot.session
+        self.shared_cache = bot.shared_cache
+        self.config = SQLiteConfigStore(path=CONFIG_DB, legacy_json=CONFIG_FILE)
+        self.limiter = RateLimiter(
+            reset_hour=int(os.environ.get("QUOTA_RESET_HOUR", 0)),
+            persist=self.config.set_quota
+        )
+        self.info_cache = TTLCache(
+            ttl=int(os.environ.get("INFO_CACHE_TTL", 300)),
+            stale_ttl=int(os.environ.get("INFO_CACHE_STALE_TTL", 900)),
+            max_entries=int(os.environ.get("INFO_CACHE_MAX_ENTRIES", 5000))
+        )
+        self.flights = SingleFlight()
+        self.max_image_bytes = int(os.environ.get("IMAGE_MAX_BYTES", 8 * 1024 * 1024))
+        self.image_byte_budget = int(os.environ.get("IMAGE_BYTE_BUDGET", 1_500_000))
+        self.image_workers = int(os.environ.get("IMAGE_WORKERS", 1))
+        self.image_pool = None
+        # How long the embed waits for its images before they are dropped
+        self.image_wait = float(os.environ.get("IMAGE_WAIT_SECONDS", 20))
+        self.popularity = PopularityTracker(
+            half_life=int(os.environ.get("POPULARITY_HALF_LIFE", 1800)),
+            max_keys=int(os.environ.get("POPULARITY_MAX_KEYS", 10000))
+        )
+        self.tracer = Tracer(
+            slow_threshold=float(os.environ.get("SLOW_REQUEST_SECONDS", 2.0)),
+            profile_every=int(os.environ.get("PROFILE_SAMPLE_RATE", 0)),
+            profile_dir=os.environ.get("PROFILE_DIR", "profiles")
+        )
+        self.prefetch_top_k = int(os.environ.get("PREFETCH_TOP_K", 50))
+        self.prefetch_budget = int(os.environ.get("PREFETCH_BUDGET", 30))
+        self.prefetch_margin = 90
+        self.prefetched = 0
+        self.batch_max_uids = 25
+        self.batch_concurrency = 5
+        self.batch_page_size = 10
+        self.image_store = ImageStore(
+            root=os.environ.get("IMAGE_CACHE_DIR", "image_cache"),
+            max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_MB", 256)) * 1024 * 1024,
+            max_age=int(os.environ.get("IMAGE_CACHE_MAX_AGE", 6 * 3600))
+        )
+        self._refreshing = set()
+        self._background_tasks = set()
 
     # Custom emojis dictionary
     EMOJIS = {
@@ -62,66 +141,272 @@ class InfoCommands(commands.Cog):
     def convert_unix_timestamp(self, timestamp: int) -> str:
         return datetime.utcfromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
 
-    def check_request_limit(self, guild_id):
-        try:
-            return self.is_server_subscribed(guild_id) or not self.is_limit_reached(guild_id)
-        except Exception as e:
-            print(f"Error checking request limit: {e}")
-            return False
+    def is_server_subscribed(self, guild_id):
+        return bool(self.config.guild_setting(guild_id, "subscribed", False))
 
-    def load_config(self):
-        default_config = {
-            "servers": {},
-            "global_settings": {
-                "default_all_channels": False,
-                "default_cooldown": 30,
-                "default_daily_limit": 30
-            }
-        }
+    def get_daily_limit(self, guild_id):
+        # An explicit None ("off") means unlimited; unset guilds get the global default
+        return self.config.guild_setting(guild_id, "daily_limit", self.config.global_settings["default_daily_limit"])
 
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    loaded_config = json.load(f)
-                    loaded_config.setdefault("global_settings", {})
-                    loaded_config["global_settings"].setdefault("default_all_channels", False)
-                    loaded_config["global_settings"].setdefault("default_cooldown", 30)
-                    loaded_config["global_settings"].setdefault("default_daily_limit", 30)
-                    loaded_config.setdefault("servers", {})
-                    return loaded_config
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading config: {e}")
-                return default_config
-        return default_config
-
-    def save_config(self):
-        try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.config_data, f, indent=4, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error saving config: {e}")
+    def check_request_limit(self, guild_id, user_id, cost=1):
+        """Charge a command to the user's cooldown and ``cost`` lookups to the guild's quota.
+
+        Returns ``(allowed, reason, retry_after)`` from the rate limiter.
+        """
+        cooldown = self.config.guild_setting(guild_id, "cooldown", self.config.global_settings["default_cooldown"])
+        daily_limit = None if self.is_server_subscribed(guild_id) else self.get_daily_limit(guild_id)
+        return self.limiter.check(user_id, guild_id, cooldown, daily_limit, cost)
+
+    async def _send_limit_rejection(self, ctx, guild_id, reason, retry_after):
+        if reason == "cooldown":
+            COOLDOWN_REJECTIONS.inc()
+            return await ctx.send(f"{self.EMOJIS['warning']} Please wait {math.ceil(retry_after)}s before using this command again", ephemeral=True)
+        QUOTA_REJECTIONS.inc()
+        hours, minutes = divmod(math.ceil(retry_after / 60), 60)
+        return await ctx.send(f"{self.EMOJIS['warning']} This server has reached its daily limit of {self.get_daily_limit(guild_id)} lookups. It resets in {hours}h {minutes}m", ephemeral=True)
 
     async def is_channel_allowed(self, ctx):
         try:
             guild_id = str(ctx.guild.id)
-            allowed_channels = self.config_data["servers"].get(guild_id, {}).get("info_channels", [])
+            allowed_channels = self.config.channels(guild_id)
 
             if not allowed_channels:
                 return True
 
             return str(ctx.channel.id) in allowed_channels
         except Exception as e:
-            print(f"Error checking channel permission: {e}")
+            log.error("Error checking channel permission: %s", e)
             return False
 
+    def _on_breaker_change(self, breaker, old, new):
+        log.warning("Circuit breaker for %s: %s -> %s", breaker.name, old, new)
+
+    async def _fetch_info(self, uid, attempt):
+        """Return ``(status, data)`` from the info API; ``data`` is only set on a 200."""
+        with UPSTREAM_LATENCY.labels("info").time():
+            async with self.session.get(
+                f"{self.api_url}?uid={uid}",
+                timeout=request_timeout(self.session, attempt.timeout),
+                trace_request_ctx=attempt
+            ) as response:
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.json()
+
+    def _call_info(self, uid):
+        return self.flights.do(
+            (self.api_url, uid),
+            lambda: self.upstreams["info"].call(lambda attempt: self._fetch_info(uid, attempt))
+        )
+
+    async def _get_info(self, uid):
+        """Serve info from the cache, refreshing stale entries in the background."""
+        data, state = self.info_cache.get(uid)
+        if state is None and self.shared_cache:
+            data, state = await self._get_shared_info(uid)
+        if state == TTLCache.STALE and uid not in self._refreshing:
+            self._refreshing.add(uid)
+            self._run_in_background(self._refresh_info(uid))
+        if data is not None:
+            return 200, data
+
+        status, data = await self._call_info(uid)
+        if status == 200:
+            self._store_info(uid, data)
+        return status, data
+
+    async def _get_shared_info(self, uid):
+        """Look ``uid`` up in the cross-process cache and promote hits into the local one."""
+        try:
+            found = await asyncio.to_thread(self.shared_cache.get, uid)
+        except Exception as e:
+            log.warning("Shared cache read failed: %r", e)
+            return None, None
+        if found is None:
+            return None, None
+        data, age = found
+        self.info_cache.set(uid, data, age=age)
+        return data, TTLCache.FRESH if age < self.info_cache.ttl else TTLCache.STALE
+
+    def _store_info(self, uid, data):
+        self.info_cache.set(uid, data)
+        if self.shared_cache:
+            self._run_in_background(asyncio.to_thread(self.shared_cache.set, uid, data))
+
+    def _run_in_background(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_done)
+        return task
+
+    def _background_done(self, task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            log.error("Background task failed: %r", task.exception())
+
+    async def _refresh_info(self, uid):
+        try:
+            status, data = await self._call_info(uid)
+            if status == 200:
+                self._store_info(uid, data)
+        except Exception as e:
+            log.warning("Background refresh for %s failed: %r", uid, e)
+        finally:
+            self._refreshing.discard(uid)
+
+    async def _fetch_image(self, kind, base_url, uid, label):
+        """Return a cached image path for ``uid``, downloading it on a miss."""
+        path = self.image_store.get(f"{kind}:{uid}")
+        if path:
+            return path
+        return await self.flights.do(
+            (base_url, uid),
+            lambda: self._download_image(kind, base_url, uid, label)
+        )
+
+    async def _request_image(self, kind, base_url, uid, attempt):
+        """Stream an image straight into the image store and return ``(status, path)``.
+
+        The download is aborted as soon as the content type is not an image or
+        the body exceeds ``max_image_bytes``; only one chunk is held in memory.
+        """
+        with UPSTREAM_LATENCY.labels(kind).time():
+            async with self.session.get(
+                f"{base_url}?uid={uid}",
+                timeout=request_timeout(self.session, attempt.timeout),
+                trace_request_ctx=attempt
+            ) as response:
+                if response.status != 200:
+                    return response.status, None
+                if not response.content_type.startswith("image/"):
+                    IMAGE_REJECTIONS.labels("content_type").inc()
+                    raise ImageRejected("content_type", response.content_type)
+                if response.content_length and response.content_length > self.max_image_bytes:
+                    IMAGE_REJECTIONS.labels("too_large").inc()
+                    raise ImageRejected("too_large", f"{response.content_length} bytes")
+
+                writer = self.image_store.open_writer()
+                IMAGE_DOWNLOADS_IN_FLIGHT.inc()
+                try:
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        writer.write(chunk)
+                        if writer.size > self.max_image_bytes:
+                            IMAGE_REJECTIONS.labels("too_large").inc()
+                            raise ImageRejected("too_large", f"over {self.max_image_bytes} bytes")
+                except BaseException:
+                    writer.abort()
+                    raise
+                finally:
+                    IMAGE_DOWNLOADS_IN_FLIGHT.dec()
+
+        IMAGE_BYTES.observe(writer.size)
+        return 200, await asyncio.to_thread(writer.commit, f"{kind}:{uid}")
+
+    async def _download_image(self, kind, base_url, uid, label):
+        """Download an image into the image store; failures are logged and return None.
+
+        An open circuit breaker skips the endpoint immediately.
+        """
+        try:
+            status, path = await self.upstreams[kind].call(lambda attempt: self._request_image(kind, base_url, uid, attempt))
+            if status != 200:
+                log.warning("%s HTTP Error: %s", label, status)
+                return None
+            log.debug("%s image fetched successfully", label)
+            return path
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            log.warning("%s fetch failed: %r", label, e)
+        return None
+
+    def _open_image(self, path, filename):
+        """Open a cached image as a discord.File, or None if it was evicted meanwhile."""
+        try:
+            return discord.File(path, filename=filename)
+        except OSError:
+            return None
+
+    def _composite_key(self, card_path, outfit_path):
+        # Blob names are content hashes, so the key changes whenever either input does
+        return f"composite:{os.path.basename(card_path)}:{os.path.basename(outfit_path)}"
+
+    async def _composite(self, card_path, outfit_path):
+        """Return the path of the composited card + outfit image, rendering it on a miss."""
+        key = self._composite_key(card_path, outfit_path)
+        path = self.image_store.get(key)
+        if path:
+            return path
+        return await self.flights.do(key, lambda: self._render_composite(key, card_path, outfit_path))
+
+    async def _render_composite(self, key, card_path, outfit_path):
+        if self.image_pool is None:
+            self.image_pool = ProcessPoolExecutor(
+                max_workers=self.image_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        loop = asyncio.get_running_loop()
+        data = await asyncio.wait_for(
+            loop.run_in_executor(self.image_pool, composite_images, card_path, outfit_path, self.image_byte_budget),
+            timeout=15
+        )
+        return await asyncio.to_thread(self.image_store.put, key, data)
+
+    def _separate_attachments(self, card_path, outfit_path):
+        files = []
+        if card_path:
+            files.append(self._open_image(card_path, "profile_card.png"))
+        if outfit_path:
+            files.append(self._open_image(outfit_path, f"outfit_{uuid.uuid4().hex[:8]}.png"))
+        return [file for file in files if file]
+
+    def _cached_attachments(self, uid):
+        """Return the image files for ``uid`` if all of them are already in the image store, else None."""
+        card_path = self.image_store.get(f"card:{uid}")
+        outfit_path = self.image_store.get(f"outfit:{uid}")
+        if not (card_path and outfit_path):
+            return None
+        if PIL_AVAILABLE:
+            path = self.image_store.get(self._composite_key(card_path, outfit_path))
+            file = path and self._open_image(path, f"profile_{uuid.uuid4().hex[:8]}.{image_extension(path)}")
+            return [file] if file else None
+
+        return self._separate_attachments(card_path, outfit_path) or None
+
+    async def _build_attachments(self, card_path, outfit_path):
+        """Return the image files for the lookup message, composited into one when possible."""
+        if card_path and outfit_path and PIL_AVAILABLE:
+            try:
+                path = await self._composite(card_path, outfit_path)
+                file = self._open_image(path, f"profile_{uuid.uuid4().hex[:8]}.{image_extension(path)}")
+                if file:
+                    return [file]
+            except Exception as e:
+                log.warning("Image compositing failed: %r", e)
+
+        return self._separate_attachments(card_path, outfit_path)
+
+    async def _fetch_images(self, uid):
+        """Fetch the profile card and outfit for ``uid`` concurrently.
+
+        Each upstream call has its own adaptive timeout; a failed or slow image
+        comes back as ``None``.
+        """
+        card, outfit = await asyncio.gather(
+            traced("card", self._fetch_image("card", self.profile_card_url, uid, "Profile card")),
+            traced("outfit", self._fetch_image("outfit", self.generate_url, uid, "Profile outfit")),
+            return_exceptions=True
+        )
+        return (
+            None if isinstance(card, BaseException) else card,
+            None if isinstance(outfit, BaseException) else outfit
+        )
+
     @commands.hybrid_command(name="setinfochannel", description="Allow a channel for !info commands")
     @commands.has_permissions(administrator=True)
     async def set_info_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         guild_id = str(ctx.guild.id)
-        self.config_data["servers"].setdefault(guild_id, {"info_channels": [], "config": {}})
-        if str(channel.id) not in self.config_data["servers"][guild_id]["info_channels"]:
-            self.config_data["servers"][guild_id]["info_channels"].append(str(channel.id))
-            self.save_config()
+        if self.config.add_channel(guild_id, str(channel.id)):
             await ctx.send(f"{self.EMOJIS['success']} {channel.mention} is now allowed for `!info` commands")
         else:
             await ctx.send(f"{self.EMOJIS['info']} {channel.mention} is already allowed for `!info` commands")
@@ -130,10 +415,8 @@ class InfoCommands(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def remove_info_channel(self, ctx: commands.Context, channel: discord.TextChannel):
         guild_id = str(ctx.guild.id)
-        if guild_id in self.config_data["servers"]:
-            if str(channel.id) in self.config_data["servers"][guild_id]["info_channels"]:
-                self.config_data["servers"][guild_id]["info_channels"].remove(str(channel.id))
-                self.save_config()
+        if self.config.has_guild(guild_id):
+            if self.config.remove_channel(guild_id, str(channel.id)):
                 await ctx.send(f"{self.EMOJIS['success']} {channel.mention} has been removed from allowed channels")
             else:
                 await ctx.send(f"{self.EMOJIS['error']} {channel.mention} is not in the list of allowed channels")
@@ -144,9 +427,10 @@ class InfoCommands(commands.Cog):
     async def list_info_channels(self, ctx: commands.Context):
         guild_id = str(ctx.guild.id)
 
-        if guild_id in self.config_data["servers"] and self.config_data["servers"][guild_id]["info_channels"]:
+        channel_ids = self.config.channels(guild_id)
+        if channel_ids:
             channels = []
-            for channel_id in self.config_data["servers"][guild_id]["info_channels"]:
+            for channel_id in sorted(channel_ids, key=int):
                 channel = ctx.guild.get_channel(int(channel_id))
                 channels.append(f"{self.EMOJIS['diamond']} {channel.mention if channel else f'ID: {channel_id}'}")
 
@@ -155,7 +439,7 @@ class InfoCommands(commands.Cog):
                 description="\n".join(channels),
                 color=discord.Color.blue()
             )
-            cooldown = self.config_data["servers"][guild_id]["config"].get("cooldown", self.config_data["global_settings"]["default_cooldown"])
+            cooldown = self.config.guild_setting(guild_id, "cooldown", self.config.global_settings["default_cooldown"])
             embed.set_footer(text=f"{self.EMOJIS['tick']} Current cooldown: {cooldown} seconds")
         else:
             embed = discord.Embed(
@@ -166,62 +450,190 @@ class InfoCommands(commands.Cog):
 
         await ctx.send(embed=embed)
 
-    @commands.hybrid_command(name="info", description="Displays information about a Free Fire player")
-    @app_commands.describe(uid="FREE FIRE INFO")
-    async def player_info(self, ctx: commands.Context, uid: str):
+    def parse_player_data(self, data):
+        """Split an info API payload into its sections."""
+        return {
+            "basic": data.get('basicInfo', {}),
+            "captain": data.get('captainBasicInfo', {}),
+            "clan": data.get('clanBasicInfo', {}),
+            "credit_score": data.get('creditScoreInfo', {}),
+            "pet": data.get('petInfo', {}),
+            "profile": data.get('profileInfo', {}),
+            "social": data.get('socialInfo', {})
+        }
+
+    def _format_batch_line(self, uid, status, data):
+        if status == 404:
+            LOOKUPS.labels("not_found").inc()
+            self.popularity.forget(uid)
+            return f"{self.EMOJIS['error']} `{uid}`: not found"
+        if status != 200:
+            LOOKUPS.labels("exception" if status is None else "http_error").inc()
+            return f"{self.EMOJIS['error']} `{uid}`: API error"
+
+        LOOKUPS.labels("success").inc()
+        sections = self.parse_player_data(data)
+        basic_info = sections["basic"]
+        line = (
+            f"{self.EMOJIS['diamond']} **{basic_info.get('nickname', 'Not found')}** `{uid}`"
+            f" | Lv {basic_info.get('level', '?')} | {basic_info.get('region', 'Not found')}"
+            f" | Likes {basic_info.get('liked', '?')}"
+        )
+        if sections["clan"]:
+            line += f" | {self.EMOJIS['crown']} {sections['clan'].get('clanName', 'Not found')}"
+            if sections["captain"]:
+                line += f" (Leader: {sections['captain'].get('nickname', 'Not found')})"
+        return line
+
+    def _batch_embed(self, lines, done, total):
+        embed = discord.Embed(
+            title=f"{self.EMOJIS['nexus_crown']} Batch Player Lookup",
+            description="\n".join(lines),
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=f"{done}/{total} players")
+        return embed
+
+    @commands.hybrid_command(name="infobatch", description="Displays information about several Free Fire players")
+    @app_commands.describe(uids="FREE FIRE UIDs separated by spaces")
+    async def player_info_batch(self, ctx: commands.Context, *, uids: str):
+        trace = self.tracer.start("infobatch", guild=ctx.guild.id, user=ctx.author.id, uids=len(uids.split()))
+        try:
+            await self._lookup_batch(ctx, uids, trace)
+        finally:
+            self.tracer.finish(trace)
+
+    async def _lookup_batch(self, ctx, uids, trace):
         guild_id = str(ctx.guild.id)
+        requested = list(dict.fromkeys(uids.replace(",", " ").split()))
 
-        if not uid.isdigit() or len(uid) < 6:
-            return await ctx.reply(f"{self.EMOJIS['error']} Invalid UID! It must:\n{self.EMOJIS['diamond']} Be only numbers\n{self.EMOJIS['diamond']} Have at least 6 digits", mention_author=False)
+        if not requested or any(not uid.isdigit() or len(uid) < 6 for uid in requested):
+            return await ctx.reply(f"{self.EMOJIS['error']} Invalid UID! Each one must:\n{self.EMOJIS['diamond']} Be only numbers\n{self.EMOJIS['diamond']} Have at least 6 digits", mention_author=False)
+        if len(requested) > self.batch_max_uids:
+            return await ctx.reply(f"{self.EMOJIS['error']} You can look up at most {self.batch_max_uids} UIDs at once", mention_author=False)
 
         if not await self.is_channel_allowed(ctx):
             return await ctx.send(f"{self.EMOJIS['error']} This command is not allowed in this channel.", ephemeral=True)
 
-        cooldown = self.config_data["global_settings"]["default_cooldown"]
-        if guild_id in self.config_data["servers"]:
-            cooldown = self.config_data["servers"][guild_id]["config"].get("cooldown", cooldown)
+        # The whole batch is charged to the guild quota up front
+        allowed, reason, retry_after = self.check_request_limit(guild_id, ctx.author.id, cost=len(requested))
+        if not allowed:
+            trace.outcome = reason
+            return await self._send_limit_rejection(ctx, guild_id, reason, retry_after)
 
-        if ctx.author.id in self.cooldowns:
-            last_used = self.cooldowns[ctx.author.id]
-            if (datetime.now() - last_used).seconds < cooldown:
-                remaining = cooldown - (datetime.now() - last_used).seconds
-                return await ctx.send(f"{self.EMOJIS['warning']} Please wait {remaining}s before using this command again", ephemeral=True)
+        for uid in requested:
+            self.popularity.record(uid)
 
-        self.cooldowns[ctx.author.id] = datetime.now()
+        await ctx.defer()
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
 
-        try:
-            async with ctx.typing():
-                # Get profile card image first
-                profile_card_image = None
-                profile_card_url = f"{self.profile_card_url}?uid={uid}"
+        async def lookup(uid):
+            async with semaphore:
                 try:
-                    async with self.session.get(profile_card_url) as card_file:
-                        if card_file.status == 200:
-                            profile_card_image = await card_file.read()
-                            print(f"{self.EMOJIS['success']} Profile card image fetched successfully")
-                        else:
-                            print(f"{self.EMOJIS['error']} Profile card HTTP Error: {card_file.status}")
+                    status, data = await self._get_info(uid)
                 except Exception as e:
-                    print(f"{self.EMOJIS['error']} Profile card fetch failed: {e}")
-
-                # Get player info
-                async with self.session.get(f"{self.api_url}?uid={uid}") as response:
-                    if response.status == 404:
-                        return await ctx.send(f"{self.EMOJIS['error']} Player with UID `{uid}` not found.")
-                    if response.status != 200:
-                        return await ctx.send(f"{self.EMOJIS['error']} API error. Try again later.")
-                    data = await response.json()
-
-            basic_info = data.get('basicInfo', {})
-            captain_info = data.get('captainBasicInfo', {})
-            clan_info = data.get('clanBasicInfo', {})
-            credit_score_info = data.get('creditScoreInfo', {})
-            pet_info = data.get('petInfo', {})
-            profile_info = data.get('profileInfo', {})
-            social_info = data.get('socialInfo', {})
+                    log.warning("Batch lookup for %s failed: %r", uid, e)
+                    status, data = None, None
+                return uid, status, data
+
+        pending = [asyncio.ensure_future(lookup(uid)) for uid in requested]
+        total = len(requested)
+        message = None
+        page = []
+        done = 0
+        last_edit = 0.0
+        dirty = False
+        try:
+            # Results are streamed into paged embeds in completion order
+            for next_result in asyncio.as_completed(pending):
+                line = self._format_batch_line(*(await next_result))
+                done += 1
+                if message is not None and len(page) == self.batch_page_size:
+                    if dirty:
+                        await message.edit(embed=self._batch_embed(page, done - 1, total))
+                    message, page = None, []
+                page.append(line)
+
+                now = time.monotonic()
+                if message is None:
+                    with DISCORD_SEND_LATENCY.time():
+                        message = await ctx.send(embed=self._batch_embed(page, done, total))
+                    last_edit, dirty = now, False
+                elif done == total or now - last_edit >= 1.0:
+                    with DISCORD_SEND_LATENCY.time():
+                        await message.edit(embed=self._batch_embed(page, done, total))
+                    last_edit, dirty = now, False
+                else:
+                    dirty = True
+            trace.outcome = "success"
+        except Exception as e:
+            trace.outcome = "exception"
+            log.exception("Batch of %d UIDs failed", total)
+            await ctx.send(f"{self.EMOJIS['error']} Unexpected error: `{e}`")
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @commands.hybrid_command(name="info", description="Displays information about a Free Fire player")
+    @app_commands.describe(uid="FREE FIRE INFO")
+    async def player_info(self, ctx: commands.Context, uid: str):
+        trace = self.tracer.start("info", uid=uid, guild=ctx.guild.id, user=ctx.author.id)
+        try:
+            await self._lookup_player(ctx, uid, trace)
+        finally:
+            self.tracer.finish(trace)
+
+    async def _lookup_player(self, ctx, uid, trace):
+        guild_id = str(ctx.guild.id)
+
+        if not uid.isdigit() or len(uid) < 6:
+            return await ctx.reply(f"{self.EMOJIS['error']} Invalid UID! It must:\n{self.EMOJIS['diamond']} Be only numbers\n{self.EMOJIS['diamond']} Have at least 6 digits", mention_author=False)
+
+        with trace.span("checks"):
+            channel_allowed = await self.is_channel_allowed(ctx)
+            if channel_allowed:
+                allowed, reason, retry_after = self.check_request_limit(guild_id, ctx.author.id)
+        if not channel_allowed:
+            return await ctx.send(f"{self.EMOJIS['error']} This command is not allowed in this channel.", ephemeral=True)
+        if not allowed:
+            trace.outcome = reason
+            return await self._send_limit_rejection(ctx, guild_id, reason, retry_after)
+        # Only lookups that get through count towards prefetching
+        self.popularity.record(uid)
+
+        # Images download in the background; the embed goes out as soon as the info is in
+        images = asyncio.ensure_future(self._fetch_images(uid))
+        try:
+            # typing() defers slash invocations straight away
+            async with ctx.typing():
+                with trace.span("fetch"):
+                    status, data = await traced("info", self._get_info(uid))
+                if status == 404:
+                    LOOKUPS.labels("not_found").inc()
+                    trace.outcome = "not_found"
+                    self.popularity.forget(uid)
+                    return await ctx.send(f"{self.EMOJIS['error']} Player with UID `{uid}` not found.")
+                if status != 200:
+                    LOOKUPS.labels("http_error").inc()
+                    trace.outcome = "http_error"
+                    return await ctx.send(f"{self.EMOJIS['error']} API error. Try again later.")
+
+            embed_started = time.perf_counter()
+            sections = self.parse_player_data(data)
+            basic_info = sections["basic"]
+            captain_info = sections["captain"]
+            clan_info = sections["clan"]
+            credit_score_info = sections["credit_score"]
+            pet_info = sections["pet"]
+            profile_info = sections["profile"]
+            social_info = sections["social"]
 
             region = basic_info.get('region', 'Not found')
 
+            # Guild leaders shown in embeds are likely to be looked up next
+            if captain_info and captain_info.get('accountId'):
+                self.popularity.record(str(captain_info['accountId']), weight=0.5)
+
             embed = discord.Embed(
                 title=f"{self.EMOJIS['nexus_crown']} Player Information",
                 color=discord.Color.blurple(),
@@ -294,47 +706,235 @@ class InfoCommands(commands.Cog):
 
             embed.set_footer(text="DEVELOPED BY SUMEDH")
 
-            # Send embed with profile card as main image
-            if profile_card_image:
-                # Create file object
-                with io.BytesIO(profile_card_image) as buf:
-                    file = discord.File(buf, filename="profile_card.png")
-                    # Set the image in the embed
-                    embed.set_image(url=f"attachment://{file.filename}")
-                    # Send embed with file
-                    await ctx.send(embed=embed, file=file)
-                    print(f"{self.EMOJIS['success']} Embed sent with profile card as main image")
+            trace.record("embed", embed_started)
+
+            # Images that are already cached and rendered go out with the first message
+            files = self._cached_attachments(uid) or []
+            if files:
+                images.cancel()
+                embed.set_image(url=f"attachment://{files[0].filename}")
             else:
-                # Fallback if no profile card image
                 embed.set_thumbnail(url=ctx.author.display_avatar.url)
-                await ctx.send(embed=embed)
-                print(f"{self.EMOJIS['warning']} Profile card not available, sent embed without image")
+            with DISCORD_SEND_LATENCY.time(), trace.span("send"):
+                message = await ctx.send(embed=embed, files=files) if files else await ctx.send(embed=embed)
+
+            LOOKUPS.labels("success").inc()
+            trace.outcome = "success"
+
+        except CircuitOpenError:
+            LOOKUPS.labels("http_error").inc()
+            trace.outcome = "circuit_open"
+            return await self._send_api_error(ctx)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            LOOKUPS.labels("http_error").inc()
+            trace.outcome = "http_error"
+            log.warning("Info lookup for %s failed: %r", uid, e)
+            return await self._send_api_error(ctx)
+        except Exception as e:
+            LOOKUPS.labels("exception").inc()
+            trace.outcome = "exception"
+            log.exception("Lookup for %s failed", uid)
+            return await ctx.send(f"{self.EMOJIS['error']} Unexpected error: `{e}`")
+        finally:
+            if trace.outcome != "success":
+                images.cancel()
 
-            # Send additional profile outfit image if available
-            if region and uid:
+        if files:
+            log.debug("Embed sent with %d image attachment(s)", len(files))
+            return
+        await self._attach_images(message, embed, images, trace)
+
+    async def _attach_images(self, message, embed, images, trace):
+        """Edit the profile images into an already sent lookup embed."""
+        try:
+            with trace.span("images"):
+                card_path, outfit_path = await asyncio.wait_for(images, self.image_wait)
+                files = await self._build_attachments(card_path, outfit_path)
+        except asyncio.TimeoutError:
+            log.debug("Profile images timed out, keeping embed without image")
+            return
+        except Exception as e:
+            log.warning("Profile images failed: %r", e)
+            return
+        if not files:
+            log.debug("Profile images not available, kept embed without image")
+            return
+
+        embed.set_thumbnail(url=None)
+        embed.set_image(url=f"attachment://{files[0].filename}")
+        try:
+            with DISCORD_SEND_LATENCY.time(), trace.span("edit"):
+                await message.edit(embed=embed, attachments=files)
+            log.debug("Embed edited with %d image attachment(s)", len(files))
+        except discord.HTTPException as e:
+            log.warning("Could not attach profile images: %s", e)
+
+    @tasks.loop(minutes=1)
+    async def prefetch_hot_uids(self):
+        """Refresh the most popular UIDs before their cached data expires.
+
+        Each upstream request counts against ``prefetch_budget`` per run.
+        """
+        budget = self.prefetch_budget
+        for uid in self.popularity.top(self.prefetch_top_k):
+            if budget <= 0:
+                break
+            remaining = self.info_cache.ttl_remaining(uid)
+            if remaining is None or remaining < self.prefetch_margin:
+                budget -= 1
                 try:
-                    image_url = f"{self.generate_url}?uid={uid}"
-                    print(f"Profile Image URL = {image_url}")
-                    
-                    if image_url:
-                        async with self.session.get(image_url) as img_file:
-                            if img_file.status == 200:
-                                with io.BytesIO(await img_file.read()) as buf:
-                                    file = discord.File(buf, filename=f"outfit_{uuid.uuid4().hex[:8]}.png")
-                                    await ctx.send(file=file)
-                                    print(f"{self.EMOJIS['success']} Profile outfit image sent successfully")
-                            else:
-                                print(f"{self.EMOJIS['error']} Profile image HTTP Error: {img_file.status}")
+                    status, data = await self._call_info(uid)
+                    if status == 200:
+                        self._store_info(uid, data)
+                        self.prefetched += 1
+                    elif status == 404:
+                        # Unknown UIDs are never cached, so they would be retried every run
+                        self.popularity.forget(uid)
+                        continue
                 except Exception as e:
-                    print(f"{self.EMOJIS['error']} Profile image generation failed: {e}")
+                    log.warning("Prefetch for %s failed: %r", uid, e)
+
+            paths = {}
+            for kind, base_url, label in (
+                ("card", self.profile_card_url, "Profile card"),
+                ("outfit", self.generate_url, "Profile outfit")
+            ):
+                key = f"{kind}:{uid}"
+                remaining = self.image_store.ttl_remaining(key)
+                if (remaining is None or remaining < self.prefetch_margin) and budget > 0:
+                    budget -= 1
+                    paths[kind] = await self.flights.do(
+                        (base_url, uid),
+                        lambda kind=kind, base_url=base_url, label=label: self._download_image(kind, base_url, uid, label)
+                    )
+                else:
+                    paths[kind] = self.image_store.get(key)
+
+            # Compositing costs CPU but no upstream budget
+            if paths["card"] and paths["outfit"] and PIL_AVAILABLE:
+                try:
+                    await self._composite(paths["card"], paths["outfit"])
+                except Exception as e:
+                    log.warning("Prefetch composite for %s failed: %r", uid, e)
+
+    @prefetch_hot_uids.before_loop
+    async def before_prefetch(self):
+        await self.bot.wait_until_ready()
+
+    async def _check_local_guild(self, ctx, guild_id):
+        # Guild settings are cached per process, so only the cluster that owns the guild can change them
+        if self.bot.get_guild(guild_id) is not None:
+            return True
+        await ctx.send(f"{self.EMOJIS['error']} Server `{guild_id}` is not on this cluster's shards; run the command from a server on the same cluster")
+        return False
+
+    @commands.command(name="setdailylimit")
+    @commands.is_owner()
+    async def set_daily_limit(self, ctx: commands.Context, guild_id: int, limit: str = "default"):
+        """Set a guild's daily lookup quota: a number, "default" or "off"."""
+        if not await self._check_local_guild(ctx, guild_id):
+            return
+        if limit == "default":
+            self.config.clear_guild_setting(str(guild_id), "daily_limit")
+            value = self.get_daily_limit(str(guild_id))
+        elif limit == "off":
+            value = None
+            self.config.set_guild_setting(str(guild_id), "daily_limit", value)
+        elif limit.isdigit() and int(limit) > 0:
+            value = int(limit)
+            self.config.set_guild_setting(str(guild_id), "daily_limit", value)
+        else:
+            return await ctx.send(f"{self.EMOJIS['error']} Limit must be a positive number, `default` or `off`")
 
-        except Exception as e:
-            await ctx.send(f"{self.EMOJIS['error']} Unexpected error: `{e}`")
-        finally:
-            gc.collect()
+        if value is None:
+            await ctx.send(f"{self.EMOJIS['success']} Server `{guild_id}` no longer has a daily limit")
+        else:
+            await ctx.send(f"{self.EMOJIS['success']} Server `{guild_id}` is limited to {value} lookups per day")
+
+    @commands.command(name="setsubscribed")
+    @commands.is_owner()
+    async def set_subscribed(self, ctx: commands.Context, guild_id: int, subscribed: bool):
+        """Exempt a guild from its daily limit, or remove the exemption."""
+        if not await self._check_local_guild(ctx, guild_id):
+            return
+        self.config.set_guild_setting(str(guild_id), "subscribed", subscribed)
+        state = "subscribed" if subscribed else "no longer subscribed"
+        await ctx.send(f"{self.EMOJIS['success']} Server `{guild_id}` is {state}")
+
+    @commands.command(name="botstats")
+    @commands.is_owner()
+    async def show_bot_stats(self, ctx: commands.Context):
+        embed = discord.Embed(
+            title=f"{self.EMOJIS['server']} Bot Stats",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="Info cache",
+            value="\n".join(f"**{key}**: {value}" for key, value in self.info_cache.stats().items()),
+            inline=False
+        )
+        if self.shared_cache:
+            embed.add_field(
+                name="Shared cache",
+                value="\n".join(f"**{key}**: {value}" for key, value in self.shared_cache.stats().items()),
+                inline=False
+            )
+        embed.add_field(
+            name="Prefetch",
+            value="\n".join([
+                f"**tracked**: {len(self.popularity)}",
+                f"**prefetched**: {self.prefetched}",
+                f"**budget/min**: {self.prefetch_budget}"
+            ]),
+            inline=False
+        )
+        embed.add_field(
+            name="Request coalescing",
+            value="\n".join(f"**{key}**: {value}" for key, value in self.flights.stats().items()),
+            inline=False
+        )
+        embed.add_field(
+            name="Image cache",
+            value="\n".join(f"**{key}**: {value}" for key, value in self.image_store.stats().items()),
+            inline=False
+        )
+        embed.add_field(
+            name="Rate limiter",
+            value="\n".join(f"**{key}**: {value}" for key, value in self.limiter.stats().items()),
+            inline=False
+        )
+        for name, upstream in self.upstreams.items():
+            transitions = [
+                f"{datetime.utcfromtimestamp(at).strftime('%H:%M:%S')} {old} -> {new}"
+                for at, old, new in upstream.breaker.transitions
+            ]
+            embed.add_field(
+                name=f"Upstream: {name}",
+                value="\n".join(
+                    [f"**{key}**: {value}" for key, value in upstream.stats().items()]
+                    + (["**transitions**:"] + transitions[-3:] if transitions else [])
+                ),
+                inline=True
+            )
+        embed.add_field(
+            name="HTTP pool",
+            value="\n".join(f"**{key}**: {value}" for key, value in self.bot.pool_stats.stats().items()),
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    async def cog_load(self):
+        await self.config.start()
+        self.limiter.restore(self.config.quotas)
+        if self.prefetch_budget > 0:
+            self.prefetch_hot_uids.start()
 
     async def cog_unload(self):
-        await self.session.close()
+        self.prefetch_hot_uids.cancel()
+        await self.config.close()
+        if self.image_pool:
+            self.image_pool.shutdown(wait=False, cancel_futures=True)
+        await asyncio.to_thread(self.image_store.flush)
 
     async def _send_player_not_found(self, ctx, uid):
         embed = discord.Embed(
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+
+from utils.config_store import SQLiteConfigStore
+
+LEGACY = {
+    "servers": {
+        "100000000000000001": {
+            "info_channels": ["200000000000000001", "200000000000000002"],
+            "config": {"cooldown": 10}
+        },
+        "100000000000000002": {"info_channels": [], "config": {}}
+    },
+    "global_settings": {
+        "default_all_channels": True,
+        "default_cooldown": 45,
+        "default_daily_limit": 30
+    }
+}
+
+
+def test_legacy_json_is_migrated_once_and_survives_reopening(tmp_path):
+    db_path = str(tmp_path / "info_channels.db")
+    legacy_path = str(tmp_path / "info_channels.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump(LEGACY, f, indent=4)
+
+    async def open_store():
+        store = SQLiteConfigStore(path=db_path, legacy_json=legacy_path)
+        await store.start()
+        return store
+
+    async def scenario():
+        store = await open_store()
+        await store.close()
+        assert store._conn is None
+        assert not os.path.exists(legacy_path)
+        assert os.path.exists(legacy_path + ".migrated")
+
+        store = await open_store()
+        try:
+            assert store.channels("100000000000000001") == {"200000000000000001", "200000000000000002"}
+            assert store.has_guild("100000000000000002")
+            assert not store.channels("100000000000000002")
+            assert store.guild_setting("100000000000000001", "cooldown") == 10
+            assert store.global_settings["default_cooldown"] == 45
+            assert store.global_settings["default_all_channels"] is True
+        finally:
+            await store.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,70 @@
+import asyncio
+
+from aiohttp import web
+
+from utils.http import create_session, request_timeout
+from utils.resilience import Attempt
+
+
+async def start_server(delay):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+def test_in_flight_settles_after_cancellation():
+    async def scenario():
+        runner, url = await start_server(delay=1)
+        session, stats = create_session()
+        try:
+            task = asyncio.ensure_future(session.get(url))
+            while stats.in_flight == 0:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert stats.in_flight == 0
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
+
+
+def test_request_timeout_keeps_session_connect_limit():
+    async def scenario():
+        session, _ = create_session()
+        try:
+            timeout = request_timeout(session, 2.0)
+            assert timeout.connect == session.timeout.connect
+            assert timeout.sock_connect == timeout.sock_read == 2.0
+        finally:
+            await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_attempt_clock_starts_when_connection_is_acquired():
+    async def scenario():
+        runner, url = await start_server(delay=0)
+        session, _ = create_session()
+        try:
+            attempt = Attempt(5.0)
+            created = attempt.started_at
+            await asyncio.sleep(0.05)
+            async with session.get(url, trace_request_ctx=attempt) as response:
+                await response.read()
+            assert attempt.started_at > created
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    asyncio.run(scenario())
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+
+import pytest
+
+from utils.image_store import ImageStore
+
+
+def test_writes_survive_restart_through_the_journal(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    path = store.put("card:1", b"card")
+    store.put("outfit:1", b"outfit")
+    assert os.path.exists(store.journal_path)
+    assert not os.path.exists(store.index_path)
+
+    reopened = ImageStore(root=str(tmp_path))
+    assert reopened.get("card:1") == path
+    assert reopened.get("outfit:1") is not None
+    # Loading folds the journal into the snapshot
+    assert os.path.exists(reopened.index_path)
+    assert not os.path.exists(reopened.journal_path)
+
+
+def test_journal_is_compacted_once_it_outgrows_the_index(tmp_path):
+    store = ImageStore(root=str(tmp_path), compact_after=10)
+    for uid in range(25):
+        store.put(f"card:{uid}", str(uid).encode())
+    assert os.path.exists(store.index_path)
+    assert store._journal_lines < 25
+    assert ImageStore(root=str(tmp_path)).stats()["keys"] == 25
+
+
+def test_expired_keys_and_their_blobs_are_pruned(tmp_path):
+    store = ImageStore(root=str(tmp_path), max_age=60)
+    old = store.put("card:1", b"old")
+    store.put("card:2", b"new")
+    store._keys["card:1"]["stored_at"] = time.time() - 120
+
+    store.flush()
+    assert "card:1" not in store._keys
+    assert not os.path.exists(old)
+    assert store.stats()["blobs"] == 1
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    store.put("card:1", b"card")
+    store._journal.close()
+    with open(store.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"key": "card:2", "ha')
+
+    assert ImageStore(root=str(tmp_path)).get("card:1") is not None
+
+
+def test_reads_do_not_wait_for_the_snapshot_write(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    store.put("card:1", b"card")
+    writing, release = threading.Event(), threading.Event()
+    atomic_write = store._atomic_write
+
+    def slow_write(path, data):
+        writing.set()
+        release.wait(5)
+        atomic_write(path, data)
+
+    store._atomic_write = slow_write
+    thread = threading.Thread(target=store.flush)
+    thread.start()
+    try:
+        assert writing.wait(5)
+        assert store._lock.acquire(timeout=1)
+        store._lock.release()
+        assert store.get("card:1") is not None
+        store.put("card:2", b"card 2")
+    finally:
+        release.set()
+        thread.join()
+
+    reopened = ImageStore(root=str(tmp_path))
+    assert reopened.get("card:1") is not None
+    assert reopened.get("card:2") is not None
+
+
+def test_failed_snapshot_write_keeps_the_journal(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    store.put("card:1", b"card")
+
+    def failing_write(path, data):
+        raise OSError("disk full")
+
+    store._atomic_write = failing_write
+    with pytest.raises(OSError):
+        store.flush()
+    store.put("card:2", b"card 2")
+    with pytest.raises(OSError):
+        store.flush()
+
+    reopened = ImageStore(root=str(tmp_path))
+    assert reopened.get("card:1") is not None
+    assert reopened.get("card:2") is not None
+
+
+def test_dropping_a_blob_removes_every_key_that_shares_it(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    path = store.put("card:1", b"same")
+    store.put("card:2", b"same")
+    store.put("card:3", b"other")
+    os.remove(path)
+
+    assert store.get("card:1") is None
+    assert "card:2" not in store._keys
+    assert store.get("card:3") is not None
+    assert os.path.basename(path) not in store._refs
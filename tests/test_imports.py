@@ -0,0 +1,17 @@
+import importlib
+
+import pytest
+from discord.ext import commands
+
+
+@pytest.mark.parametrize("module", ["app", "cluster", "cogs.infoCommands"])
+def test_module_imports(module):
+    importlib.import_module(module)
+
+
+def test_cog_registers_commands():
+    from cogs.infoCommands import InfoCommands
+
+    names = {command.name for command in InfoCommands.__cog_commands__}
+    assert {"info", "infobatch", "setinfochannel", "removeinfochannel", "infochannels", "setdailylimit", "setsubscribed", "botstats"} <= names
+    assert issubclass(InfoCommands, commands.Cog)
@@ -0,0 +1,145 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bench.fake_context import FakeContext
+from bench.stub_servers import make_info
+from cogs.infoCommands import InfoCommands
+
+GUILD_ID = 100000000000000001
+CHANNEL_ID = 200000000000000001
+UID = "12345678"
+
+
+def make_cog(status, data=None):
+    cog = InfoCommands(SimpleNamespace(session=None, pool_stats=None, shared_cache=None))
+
+    async def get_info(uid):
+        return status, data
+
+    async def fetch_images(uid):
+        return None, None
+
+    cog._get_info = get_info
+    cog._fetch_images = fetch_images
+    return cog
+
+
+async def lookup(cog, author_id=1):
+    ctx = FakeContext(GUILD_ID, CHANNEL_ID, author_id=author_id)
+    await cog.player_info.callback(cog, ctx, UID)
+    return ctx
+
+
+def test_rejected_lookups_do_not_count_towards_popularity(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        cog = make_cog(500)
+        await cog.config.start()
+        try:
+            await lookup(cog)
+            ctx = await lookup(cog)
+            assert "Please wait" in ctx.events[-1]["content"]
+            assert cog.popularity.score(UID) == pytest.approx(1.0)
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
+
+
+def test_not_found_uids_are_forgotten(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        cog = make_cog(404)
+        await cog.config.start()
+        try:
+            ctx = await lookup(cog)
+            assert "not found" in ctx.events[-1]["content"]
+            assert UID not in cog.popularity.top(10)
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
+
+
+def test_player_without_guild_leader(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = make_info(UID, 0)
+    data["captainBasicInfo"] = None
+
+    async def scenario():
+        cog = make_cog(200, data)
+        await cog.config.start()
+        try:
+            ctx = await lookup(cog)
+            assert ctx.events[-1]["embed"]
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
+
+
+def test_unconfigured_guilds_get_the_default_daily_limit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        cog = make_cog(404)
+        await cog.config.start()
+        try:
+            guild_id = str(GUILD_ID)
+            cog.config.global_settings["default_daily_limit"] = 1
+            assert cog.check_request_limit(guild_id, 1)[0]
+            allowed, reason, _ = cog.check_request_limit(guild_id, 2)
+            assert not allowed and reason == "quota"
+
+            cog.config.set_guild_setting(guild_id, "daily_limit", None)
+            assert cog.check_request_limit(guild_id, 3)[0]
+
+            cog.config.clear_guild_setting(guild_id, "daily_limit")
+            assert cog.get_daily_limit(guild_id) == 1
+            cog.config.set_guild_setting(guild_id, "subscribed", True)
+            assert cog.check_request_limit(guild_id, 4)[0]
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
+
+
+def test_owner_settings_reject_guilds_on_other_clusters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        cog = make_cog(404)
+        cog.bot.get_guild = lambda guild_id: None
+        await cog.config.start()
+        try:
+            ctx = FakeContext(GUILD_ID, CHANNEL_ID, author_id=1)
+            await cog.set_subscribed.callback(cog, ctx, GUILD_ID, True)
+            assert "not on this cluster" in ctx.events[-1]["content"]
+            assert not cog.is_server_subscribed(str(GUILD_ID))
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
+
+
+def test_cached_images_go_out_with_the_first_message(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def scenario():
+        cog = make_cog(200, make_info(UID, 0))
+        await cog.config.start()
+        try:
+            card = cog.image_store.put(f"card:{UID}", b"card")
+            outfit = cog.image_store.put(f"outfit:{UID}", b"outfit")
+            cog.image_store.put(cog._composite_key(card, outfit), b"composite")
+            ctx = await lookup(cog)
+            assert [event["kind"] for event in ctx.events] == ["send"]
+            assert ctx.events[0]["attachments"] == 1
+        finally:
+            await cog.config.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,18 @@
+from utils.popularity import PopularityTracker
+
+
+def test_top_orders_by_score():
+    tracker = PopularityTracker()
+    for key, hits in (("a", 1), ("b", 3), ("c", 2)):
+        for _ in range(hits):
+            tracker.record(key)
+    assert tracker.top(2) == ["b", "c"]
+
+
+def test_forget_drops_a_key():
+    tracker = PopularityTracker()
+    tracker.record("404")
+    tracker.forget("404")
+    tracker.forget("never-seen")
+    assert tracker.top(5) == []
+    assert len(tracker) == 0
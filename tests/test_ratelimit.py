@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from utils import ratelimit
+from utils.config_store import SQLiteConfigStore
+from utils.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=datetime(2026, 1, 1, 5, 59, tzinfo=timezone.utc).timestamp())
+    monkeypatch.setattr(ratelimit, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_quota_window_rolls_over_at_reset_hour(clock):
+    limiter = RateLimiter(reset_hour=6)
+    assert limiter.check(1, "guild", cooldown=0, daily_limit=1)[0]
+
+    allowed, reason, retry_after = limiter.check(2, "guild", cooldown=0, daily_limit=1)
+    assert (allowed, reason) == (False, "quota")
+    assert retry_after == pytest.approx(60)
+
+    clock.now += 60
+    assert limiter.quota_used("guild") == 0
+    assert limiter.check(2, "guild", cooldown=0, daily_limit=1)[0]
+
+
+def test_refilled_buckets_are_pruned_from_the_heap(clock):
+    limiter = RateLimiter()
+    users = RateLimiter.PRUNE_PER_CHECK + 8
+    for user_id in range(users):
+        assert limiter.check(user_id, "guild", cooldown=10)[0]
+    assert limiter.check(0, "guild", cooldown=10)[1] == "cooldown"
+
+    clock.now += 11
+    limiter.check("late", "guild", cooldown=10)
+    assert limiter.stats()["buckets"] == users - RateLimiter.PRUNE_PER_CHECK + 1
+    limiter.check("later", "guild", cooldown=10)
+    assert limiter.stats() == {"buckets": 2, "expiry_heap": 2, "guild_quotas": 1}
+
+
+def test_quota_counters_survive_a_restart(clock, tmp_path):
+    db_path = str(tmp_path / "info_channels.db")
+
+    async def open_store():
+        store = SQLiteConfigStore(path=db_path, legacy_json=None)
+        await store.start()
+        return store
+
+    async def scenario():
+        store = await open_store()
+        limiter = RateLimiter(reset_hour=6, persist=store.set_quota)
+        for user_id in range(3):
+            assert limiter.check(user_id, "guild", cooldown=0, daily_limit=3)[0]
+        await store.close()
+
+        store = await open_store()
+        try:
+            restored = RateLimiter(reset_hour=6, persist=store.set_quota)
+            restored.restore(store.quotas)
+            assert restored.quota_used("guild") == 3
+            assert restored.check(4, "guild", cooldown=0, daily_limit=3)[1] == "quota"
+
+            # Counters from an earlier window do not carry over
+            clock.now += 60
+            assert restored.quota_used("guild") == 0
+        finally:
+            await store.close()
+
+    asyncio.run(scenario())
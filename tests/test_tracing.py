@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def test_queued_records_are_written_before_exit():
+    script = (
+        "import logging\n"
+        "from utils.tracing import setup_logging\n"
+        "setup_logging()\n"
+        "logging.getLogger('app').error('Critical error: boom')\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert "Critical error: boom" in result.stderr
@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU cache with a TTL and a stale-while-revalidate window."""
+
+    FRESH = "fresh"
+    STALE = "stale"
+
+    def __init__(self, ttl=300, stale_ttl=900, max_entries=5000):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return ``(value, state)`` where state is FRESH, STALE or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+
+        age = time.monotonic() - entry[0]
+        if age >= self.ttl + self.stale_ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None, None
+
+        self._entries.move_to_end(key)
+        if age < self.ttl:
+            self.hits += 1
+            return entry[1], self.FRESH
+        self.stale_hits += 1
+        return entry[1], self.STALE
+
+    def ttl_remaining(self, key):
+        """Seconds until ``key`` turns stale (negative once stale), or None if absent.
+
+        Unlike ``get`` this does not touch the hit counters or the LRU order.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return self.ttl - (time.monotonic() - entry[0])
+
+    def set(self, key, value, age=0.0):
+        """Store ``value``; ``age`` backdates entries that were fetched elsewhere."""
+        self._entries[key] = (time.monotonic() - age, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+
+log = logging.getLogger(__name__)
+
+DEFAULT_GLOBAL_SETTINGS = {
+    "default_all_channels": False,
+    "default_cooldown": 30,
+    "default_daily_limit": 30
+}
+
+
+class ConfigStore:
+    """Guild config served from an in-memory index and persisted write-behind.
+
+    Reads never touch storage. Writes update the index immediately and queue an
+    operation; queued operations are applied by the backend in one batch off
+    the event loop. Backends implement ``_load`` and ``_apply``.
+    """
+
+    def __init__(self, flush_interval=1.0):
+        self.flush_interval = flush_interval
+        self.global_settings = dict(DEFAULT_GLOBAL_SETTINGS)
+        self._guilds = set()
+        self._channels = {}  # guild_id -> set of channel ids
+        self._guild_config = {}  # guild_id -> {key: value}
+        self.quotas = {}  # guild_id -> (window, used), as loaded at start
+        self._pending = []
+        self._pending_quotas = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task = None
+
+    async def start(self):
+        global_settings, guilds, channels, guild_config, quotas = await asyncio.to_thread(self._load)
+        self.global_settings.update(global_settings)
+        self.quotas = quotas
+        self._guilds = guilds
+        self._channels = channels
+        self._guild_config = guild_config
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error("Error saving config: %s", e)
+
+    async def flush(self):
+        async with self._flush_lock:
+            if self._pending_quotas:
+                self._pending.extend(("set_quota", guild_id, window, used) for guild_id, (window, used) in self._pending_quotas.items())
+                self._pending_quotas = {}
+            if not self._pending:
+                return
+            ops, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._apply, ops)
+            except BaseException:
+                # Keep the batch so the next flush retries it
+                self._pending[:0] = ops
+                raise
+
+    # Reads
+
+    def has_guild(self, guild_id):
+        return guild_id in self._guilds
+
+    def channels(self, guild_id):
+        return self._channels.get(guild_id, frozenset())
+
+    def guild_setting(self, guild_id, key, default=None):
+        return self._guild_config.get(guild_id, {}).get(key, default)
+
+    # Writes
+
+    def add_channel(self, guild_id, channel_id):
+        """Allow ``channel_id`` in ``guild_id``; returns False if it already was."""
+        self._guilds.add(guild_id)
+        channels = self._channels.setdefault(guild_id, set())
+        if channel_id in channels:
+            return False
+        channels.add(channel_id)
+        self._pending.append(("add_channel", guild_id, channel_id))
+        return True
+
+    def remove_channel(self, guild_id, channel_id):
+        """Disallow ``channel_id`` in ``guild_id``; returns False if it was not allowed."""
+        channels = self._channels.get(guild_id)
+        if not channels or channel_id not in channels:
+            return False
+        channels.discard(channel_id)
+        self._pending.append(("remove_channel", guild_id, channel_id))
+        return True
+
+    def set_guild_setting(self, guild_id, key, value):
+        self._guilds.add(guild_id)
+        self._guild_config.setdefault(guild_id, {})[key] = value
+        self._pending.append(("set_guild_setting", guild_id, key, value))
+
+    def clear_guild_setting(self, guild_id, key):
+        """Drop a guild override so reads fall back to their default."""
+        config = self._guild_config.get(guild_id)
+        if config is None or key not in config:
+            return
+        del config[key]
+        self._pending.append(("clear_guild_setting", guild_id, key))
+
+    def set_quota(self, guild_id, window, used):
+        """Record a guild's quota usage; repeated updates coalesce until the next flush."""
+        self._pending_quotas[guild_id] = (window, used)
+
+    # Backend hooks
+
+    def _load(self):
+        """Return ``(global_settings, guilds, channels, guild_config, quotas)``."""
+        raise NotImplementedError
+
+    def _apply(self, ops):
+        """Persist a batch of operations atomically."""
+        raise NotImplementedError
+
+
+class SQLiteConfigStore(ConfigStore):
+    """SQLite backend; imports a legacy ``info_channels.json`` on first start."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS global_settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS guilds (guild_id TEXT PRIMARY KEY);
+        CREATE TABLE IF NOT EXISTS guild_channels (
+            guild_id TEXT NOT NULL,
+            channel_id TEXT NOT NULL,
+            PRIMARY KEY (guild_id, channel_id)
+        );
+        CREATE TABLE IF NOT EXISTS guild_config (
+            guild_id TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (guild_id, key)
+        );
+        CREATE TABLE IF NOT EXISTS guild_quotas (
+            guild_id TEXT PRIMARY KEY,
+            window TEXT NOT NULL,
+            used INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path="info_channels.db", legacy_json="info_channels.json", flush_interval=1.0):
+        super().__init__(flush_interval)
+        self.path = path
+        self.legacy_json = legacy_json
+        self._conn = None
+
+    async def close(self):
+        try:
+            await super().close()
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def _load(self):
+        conn = self._connect()
+        if self.legacy_json and os.path.exists(self.legacy_json):
+            self._migrate_json(conn)
+
+        global_settings = {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM global_settings")}
+        guilds = {guild_id for (guild_id,) in conn.execute("SELECT guild_id FROM guilds")}
+        channels = {}
+        for guild_id, channel_id in conn.execute("SELECT guild_id, channel_id FROM guild_channels"):
+            channels.setdefault(guild_id, set()).add(channel_id)
+        guild_config = {}
+        for guild_id, key, value in conn.execute("SELECT guild_id, key, value FROM guild_config"):
+            guild_config.setdefault(guild_id, {})[key] = json.loads(value)
+        quotas = {guild_id: (window, used) for guild_id, window, used in conn.execute("SELECT guild_id, window, used FROM guild_quotas")}
+        return global_settings, guilds, channels, guild_config, quotas
+
+    def _migrate_json(self, conn):
+        (existing,) = conn.execute("SELECT COUNT(*) FROM guilds").fetchone()
+        if existing:
+            return
+        try:
+            with open(self.legacy_json, 'r') as f:
+                legacy = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            log.error("Error loading config: %s", e)
+            return
+
+        with conn:
+            for key, value in legacy.get("global_settings", {}).items():
+                conn.execute("INSERT OR REPLACE INTO global_settings VALUES (?, ?)", (key, json.dumps(value)))
+            for guild_id, server in legacy.get("servers", {}).items():
+                conn.execute("INSERT OR IGNORE INTO guilds VALUES (?)", (guild_id,))
+                for channel_id in server.get("info_channels", []):
+                    conn.execute("INSERT OR IGNORE INTO guild_channels VALUES (?, ?)", (guild_id, channel_id))
+                for key, value in server.get("config", {}).items():
+                    conn.execute("INSERT OR REPLACE INTO guild_config VALUES (?, ?, ?)", (guild_id, key, json.dumps(value)))
+        try:
+            os.replace(self.legacy_json, self.legacy_json + ".migrated")
+        except FileNotFoundError:
+            # Another cluster process migrated it concurrently
+            return
+        log.info("Migrated %s into %s", self.legacy_json, self.path)
+
+    def _apply(self, ops):
+        conn = self._connect()
+        with conn:
+            for op, guild_id, *args in ops:
+                if op == "add_channel":
+                    conn.execute("INSERT OR IGNORE INTO guilds VALUES (?)", (guild_id,))
+                    conn.execute("INSERT OR IGNORE INTO guild_channels VALUES (?, ?)", (guild_id, args[0]))
+                elif op == "remove_channel":
+                    conn.execute("DELETE FROM guild_channels WHERE guild_id = ? AND channel_id = ?", (guild_id, args[0]))
+                elif op == "set_guild_setting":
+                    conn.execute("INSERT OR IGNORE INTO guilds VALUES (?)", (guild_id,))
+                    conn.execute("INSERT OR REPLACE INTO guild_config VALUES (?, ?, ?)", (guild_id, args[0], json.dumps(args[1])))
+                elif op == "clear_guild_setting":
+                    conn.execute("DELETE FROM guild_config WHERE guild_id = ? AND key = ?", (guild_id, args[0]))
+                elif op == "set_quota":
+                    conn.execute("INSERT OR REPLACE INTO guild_quotas VALUES (?, ?, ?)", (guild_id, args[0], args[1]))
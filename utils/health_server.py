@@ -0,0 +1,65 @@
+import math
+import resource
+
+from aiohttp import web
+
+from utils.metrics import REGISTRY, LOOP_LAG, PROCESS_MAX_RSS
+
+
+class HealthServer:
+    """Health, readiness and metrics endpoints served on the bot's own event loop."""
+
+    def __init__(self, bot, port, max_loop_lag=1.0):
+        self.bot = bot
+        self.port = port
+        self.max_loop_lag = max_loop_lag
+        self._runner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/", self.home)
+        app.router.add_get("/healthz", self.healthz)
+        app.router.add_get("/readyz", self.readyz)
+        app.router.add_get("/metrics", self.metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "0.0.0.0", self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _status(self):
+        latency = self.bot.latency
+        return {
+            "bot": str(self.bot.user) if self.bot.user else None,
+            "ready": self.bot.is_ready(),
+            "gateway_latency": latency if math.isfinite(latency) else None,
+            "loop_lag": LOOP_LAG.value,
+            "guilds": len(self.bot.guilds)
+        }
+
+    async def home(self, request):
+        """Health check endpoint for Render"""
+        return web.Response(text=f"Bot {self.bot.user or 'Loading...'} is operational")
+
+    async def healthz(self, request):
+        """Liveness: the event loop is answering requests."""
+        return web.json_response(self._status())
+
+    async def readyz(self, request):
+        """Readiness: connected to the gateway and the event loop is not stalled."""
+        status = self._status()
+        ready = (
+            status["ready"]
+            and status["gateway_latency"] is not None
+            and status["loop_lag"] <= self.max_loop_lag
+        )
+        return web.json_response(status, status=200 if ready else 503)
+
+    async def metrics(self, request):
+        """Prometheus metrics endpoint"""
+        # ru_maxrss is reported in kilobytes on Linux
+        PROCESS_MAX_RSS.set(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+        return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
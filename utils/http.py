@@ -0,0 +1,102 @@
+import os
+import time
+
+import aiohttp
+
+
+class PoolStats:
+    """Connection pool counters collected through aiohttp trace hooks.
+
+    ``in_flight`` counts requests between ``on_request_start`` and
+    ``on_request_end``/``on_request_exception``; the latter also fires on
+    cancellation, so the gauge settles back to zero. Live queue depth cannot
+    be reported: aiohttp fires no hook when a queued acquire is cancelled, so
+    only the ``queued_total`` counter is kept for the pool wait.
+    """
+
+    def __init__(self):
+        self.connector = None
+        self.queued_total = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.in_flight = 0
+
+    def trace_config(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_done)
+        trace.on_request_exception.append(self._on_request_done)
+        trace.on_connection_queued_start.append(self._on_queued_start)
+        trace.on_connection_create_start.append(self._on_connection_acquired)
+        trace.on_connection_create_end.append(self._on_create_end)
+        trace.on_connection_reuseconn.append(self._on_connection_acquired)
+        trace.on_connection_reuseconn.append(self._on_reuseconn)
+        return trace
+
+    async def _on_connection_acquired(self, session, ctx, params):
+        # Requests made with trace_request_ctx=<resilience.Attempt> start their clock here
+        attempt = ctx.trace_request_ctx
+        if attempt is not None and hasattr(attempt, "started_at"):
+            attempt.started_at = time.monotonic()
+
+    async def _on_request_start(self, session, ctx, params):
+        self.in_flight += 1
+
+    async def _on_request_done(self, session, ctx, params):
+        self.in_flight -= 1
+
+    async def _on_queued_start(self, session, ctx, params):
+        self.queued_total += 1
+
+    async def _on_create_end(self, session, ctx, params):
+        self.connections_created += 1
+
+    async def _on_reuseconn(self, session, ctx, params):
+        self.connections_reused += 1
+
+    def stats(self):
+        acquired = self.connections_created + self.connections_reused
+        connector = self.connector
+        return {
+            "limit": connector.limit if connector else 0,
+            "limit_per_host": connector.limit_per_host if connector else 0,
+            "in_flight": self.in_flight,
+            "queued_total": self.queued_total,
+            "created": self.connections_created,
+            "reused": self.connections_reused,
+            "reuse_ratio": round(self.connections_reused / acquired, 3) if acquired else 0.0
+        }
+
+
+def create_session():
+    """Create the bot-wide HTTP session and its pool stats, tuned from the environment."""
+    stats = PoolStats()
+    connector = aiohttp.TCPConnector(
+        limit=int(os.environ.get("HTTP_POOL_LIMIT", 100)),
+        limit_per_host=int(os.environ.get("HTTP_POOL_LIMIT_PER_HOST", 20)),
+        ttl_dns_cache=int(os.environ.get("HTTP_DNS_TTL", 300)),
+        keepalive_timeout=float(os.environ.get("HTTP_KEEPALIVE", 30))
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=None,
+        connect=float(os.environ.get("HTTP_CONNECT_TIMEOUT", 5)),
+        sock_read=float(os.environ.get("HTTP_READ_TIMEOUT", 15))
+    )
+    stats.connector = connector
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[stats.trace_config()]
+    )
+    return session, stats
+
+
+def request_timeout(session, seconds):
+    """The session's timeout with ``sock_connect``/``sock_read`` limited to ``seconds``.
+
+    Both only start once the request holds a connection, so the adaptive upstream
+    timeout leaves out the pool wait; ``connect`` (pool wait plus connecting)
+    keeps the session's HTTP_CONNECT_TIMEOUT.
+    """
+    base = session.timeout
+    return aiohttp.ClientTimeout(total=base.total, connect=base.connect, sock_connect=seconds, sock_read=seconds)
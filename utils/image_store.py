@@ -0,0 +1,319 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class ImageRejected(Exception):
+    """Raised when a download is not an acceptable image (wrong type or too large)."""
+
+    def __init__(self, reason, detail):
+        super().__init__(f"{reason}: {detail}")
+        self.reason = reason
+
+
+class BlobWriter:
+    """Streams data into a temporary file in the store, hashing it as it goes."""
+
+    def __init__(self, store):
+        self.store = store
+        fd, self.tmp_path = tempfile.mkstemp(dir=store.blob_dir, prefix=".tmp-")
+        self._file = os.fdopen(fd, 'wb')
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+    def commit(self, key):
+        """Move the data into place under its content hash and return the blob path."""
+        self._file.close()
+        return self.store._commit_blob(key, self.tmp_path, self._hash.hexdigest(), self.size)
+
+
+class ImageStore:
+    """Content-addressed on-disk image cache, bounded by total size with LRU eviction.
+
+    Keys such as ``card:<uid>`` point at blobs named by their SHA-256, so identical
+    images are stored once. Each write appends one line to a journal; the journal
+    is folded into the index snapshot once it outgrows the index, and on
+    ``flush()``. Both are replayed on start, so the cache survives restarts.
+
+    ``get()`` runs on the event loop, so ``_lock`` only guards the in-memory
+    index: compaction copies it under the lock and writes the snapshot after
+    releasing it.
+    """
+
+    def __init__(self, root="image_cache", max_bytes=256 * 1024 * 1024, max_age=6 * 3600, compact_after=1000):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        self.index_path = os.path.join(root, "index.json")
+        self.journal_path = os.path.join(root, "index.journal")
+        # The journal being folded into a snapshot that is not written yet
+        self.compacting_path = self.journal_path + ".compacting"
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compact_after = compact_after
+        self._keys = {}  # key -> {"hash": ..., "stored_at": ...}
+        self._blobs = OrderedDict()  # hash -> size, least recently used first
+        self._refs = {}  # hash -> set of keys pointing at it
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._journal = None
+        self._journal_lines = 0
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._load_index()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = {}
+        except (json.JSONDecodeError, IOError) as e:
+            log.warning("Error loading image cache index: %s", e)
+            index = {}
+
+        blobs = OrderedDict(index.get("blobs", []))
+        keys = dict(index.get("keys", {}))
+        self._journal_lines = self._replay_journal(self.compacting_path, blobs, keys)
+        self._journal_lines += self._replay_journal(self.journal_path, blobs, keys)
+
+        for digest, size in blobs.items():
+            if os.path.exists(self._blob_path(digest)):
+                self._blobs[digest] = size
+                self.total_bytes += size
+        now = time.time()
+        for key, entry in keys.items():
+            if entry.get("hash") in self._blobs and now - entry["stored_at"] <= self.max_age:
+                self._set_key(key, entry)
+        if self._journal_lines:
+            self._compact()
+
+    def _replay_journal(self, path, blobs, keys):
+        """Apply journal records on top of the snapshot; returns the number of records."""
+        try:
+            f = open(path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return 0
+
+        records = 0
+        with f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-append
+                    continue
+                records += 1
+                if "drop" in record:
+                    blobs.pop(record["drop"], None)
+                else:
+                    blobs[record["hash"]] = record["size"]
+                    blobs.move_to_end(record["hash"])
+                    keys[record["key"]] = {"hash": record["hash"], "stored_at": record["stored_at"]}
+        return records
+
+    def _append(self, record):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(record) + "\n")
+        self._journal.flush()
+        self._journal_lines += 1
+
+    def _set_key(self, key, entry):
+        old = self._keys.get(key)
+        if old is not None:
+            self._unref(key, old["hash"])
+        self._keys[key] = entry
+        self._refs.setdefault(entry["hash"], set()).add(key)
+
+    def _del_key(self, key):
+        entry = self._keys.pop(key)
+        self._unref(key, entry["hash"])
+
+    def _unref(self, key, digest):
+        keys = self._refs.get(digest)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._refs[digest]
+
+    def _compact(self, wait=True):
+        """Write a snapshot of the index and start a new journal.
+
+        With ``wait=False`` the call returns at once if another compaction is running.
+        """
+        if not self._compact_lock.acquire(blocking=wait):
+            return
+        try:
+            with self._lock:
+                index = self._rotate()
+            self._atomic_write(self.index_path, json.dumps(index).encode('utf-8'))
+            try:
+                os.remove(self.compacting_path)
+            except FileNotFoundError:
+                pass
+        finally:
+            self._compact_lock.release()
+
+    def _rotate(self):
+        """Prune expired keys and unreferenced blobs, set the journal aside and copy the index."""
+        now = time.time()
+        for key in [key for key, entry in self._keys.items() if now - entry["stored_at"] > self.max_age]:
+            self._del_key(key)
+        for digest in [digest for digest in self._blobs if digest not in self._refs]:
+            self._unlink_blob(digest)
+
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        # Records from here on go to a new journal; the old one is replayed on start until the snapshot is written
+        try:
+            if os.path.exists(self.compacting_path):
+                # An earlier snapshot write failed, so its records are still needed
+                with open(self.journal_path, 'rb') as src, open(self.compacting_path, 'ab') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.compacting_path)
+        except FileNotFoundError:
+            pass
+        self._journal_lines = 0
+        # Entries are replaced, never mutated, so a shallow copy is a consistent snapshot
+        return {"blobs": list(self._blobs.items()), "keys": dict(self._keys)}
+
+    def _atomic_write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key):
+        """Return the file path cached for ``key`` or None when missing or expired."""
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry["stored_at"] > self.max_age:
+                self._del_key(key)
+                self.misses += 1
+                return None
+            digest = entry["hash"]
+            path = self._blob_path(digest)
+            if digest not in self._blobs or not os.path.exists(path):
+                self._drop_blob(digest)
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(digest)
+            self.hits += 1
+            return path
+
+    def ttl_remaining(self, key):
+        """Seconds until ``key`` expires, or None if it is not cached."""
+        entry = self._keys.get(key)
+        if entry is None:
+            return None
+        return self.max_age - (time.time() - entry["stored_at"])
+
+    def open_writer(self):
+        """Start streaming a new blob; finish with ``commit(key)`` or ``abort()``."""
+        return BlobWriter(self)
+
+    def put(self, key, data):
+        """Store ``data`` under ``key`` and return the path of its blob."""
+        writer = self.open_writer()
+        try:
+            writer.write(data)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit(key)
+
+    def _commit_blob(self, key, tmp_path, digest, size):
+        path = self._blob_path(digest)
+        with self._lock:
+            if digest in self._blobs:
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+                self._blobs[digest] = size
+                self.total_bytes += size
+            self._blobs.move_to_end(digest)
+            stored_at = time.time()
+            self._set_key(key, {"hash": digest, "stored_at": stored_at})
+            self._append({"key": key, "hash": digest, "size": size, "stored_at": stored_at})
+            self._evict(keep=digest)
+            # The snapshot is rewritten after a number of writes proportional to its size
+            compact = self._journal_lines > max(self.compact_after, len(self._keys) // 2)
+        if compact:
+            self._compact(wait=False)
+        return path
+
+    def _evict(self, keep):
+        while self.total_bytes > self.max_bytes and len(self._blobs) > 1:
+            digest = next(iter(self._blobs))
+            if digest == keep:
+                break
+            self._drop_blob(digest)
+            self.evictions += 1
+
+    def _drop_blob(self, digest):
+        self._unlink_blob(digest)
+        for key in self._refs.pop(digest, ()):
+            del self._keys[key]
+        self._append({"drop": digest})
+
+    def _unlink_blob(self, digest):
+        size = self._blobs.pop(digest, None)
+        if size is not None:
+            self.total_bytes -= size
+        try:
+            os.remove(self._blob_path(digest))
+        except OSError:
+            pass
+
+    def flush(self):
+        """Fold the journal into the index, persisting the current LRU order."""
+        self._compact()
+
+    def stats(self):
+        return {
+            "blobs": len(self._blobs),
+            "keys": len(self._keys),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
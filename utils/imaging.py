@@ -0,0 +1,61 @@
+"""Compositing of the profile card and outfit into one size-capped attachment.
+
+``composite_images`` is CPU bound and meant to run in a process pool. Pillow is
+optional: without it callers fall back to attaching the original images.
+"""
+import importlib.util
+import io
+
+PIL_AVAILABLE = importlib.util.find_spec("PIL") is not None
+
+
+def _encode(image, max_bytes):
+    """Encode as WebP, stepping quality down until it fits; fall back to a quantised PNG."""
+    for quality in (90, 80, 70, 60, 50, 40):
+        buf = io.BytesIO()
+        try:
+            image.save(buf, format="WEBP", quality=quality, method=4)
+        except (KeyError, OSError):
+            break  # Pillow built without WebP support
+        if buf.tell() <= max_bytes:
+            return buf.getvalue()
+
+    buf = io.BytesIO()
+    image.convert("RGB").quantize(colors=256).save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def composite_images(card_path, outfit_path, max_bytes=1_500_000, max_width=1280):
+    """Stack the card above the outfit at a common width and encode under ``max_bytes``."""
+    from PIL import Image
+
+    images = []
+    for path in (card_path, outfit_path):
+        with Image.open(path) as image:
+            images.append(image.convert("RGBA"))
+
+    width = min(max_width, max(image.width for image in images))
+    while True:
+        scaled = [
+            image if image.width == width else image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+            for image in images
+        ]
+        canvas = Image.new("RGBA", (width, sum(image.height for image in scaled)), (0, 0, 0, 0))
+        top = 0
+        for image in scaled:
+            canvas.paste(image, (0, top))
+            top += image.height
+
+        data = _encode(canvas, max_bytes)
+        if len(data) <= max_bytes or width <= 320:
+            return data
+        width = int(width * 0.75)
+
+
+def image_extension(path):
+    """Return ``webp`` or ``png`` from a file's magic bytes."""
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return "png"
@@ -0,0 +1,187 @@
+import asyncio
+import bisect
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self):
+        return _Timer(self)
+
+
+class Family:
+    """A named metric with an optional label whose values are fixed up front.
+
+    Children are created once, so recording only touches plain attributes and
+    all text formatting is deferred to ``Registry.render``.
+    """
+
+    def __init__(self, name, kind, help_text, factory, label=None, values=()):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.label = label
+        if label:
+            self.children = {value: factory() for value in values}
+        else:
+            self.children = {None: factory()}
+
+    def labels(self, value):
+        return self.children[value]
+
+    def _series(self, value, extra=None):
+        labels = []
+        if self.label:
+            labels.append(f'{self.label}="{value}"')
+        if extra:
+            labels.append(extra)
+        return "{" + ",".join(labels) + "}" if labels else ""
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        for value, metric in self.children.items():
+            if self.kind == "histogram":
+                cumulative = 0
+                for bound, count in zip(metric.buckets, metric.counts):
+                    cumulative += count
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{self._series(value, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{self._series(value, le)} {metric.count}")
+                lines.append(f"{self.name}_sum{self._series(value)} {metric.sum}")
+                lines.append(f"{self.name}_count{self._series(value)} {metric.count}")
+            else:
+                lines.append(f"{self.name}{self._series(value)} {metric.value}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._families = []
+
+    def _register(self, name, kind, help_text, factory, label, values):
+        family = Family(name, kind, help_text, factory, label, values)
+        self._families.append(family)
+        return family if label else family.children[None]
+
+    def counter(self, name, help_text, label=None, values=()):
+        return self._register(name, "counter", help_text, Counter, label, values)
+
+    def gauge(self, name, help_text, label=None, values=()):
+        return self._register(name, "gauge", help_text, Gauge, label, values)
+
+    def histogram(self, name, help_text, label=None, values=(), buckets=DEFAULT_BUCKETS):
+        return self._register(name, "histogram", help_text, lambda: Histogram(buckets), label, values)
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for family in self._families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "ffbot_upstream_latency_seconds", "Latency of upstream API calls",
+    label="upstream", values=("info", "card", "outfit")
+)
+DISCORD_SEND_LATENCY = REGISTRY.histogram(
+    "ffbot_discord_send_latency_seconds", "Latency of Discord message sends"
+)
+LOOKUPS = REGISTRY.counter(
+    "ffbot_lookups_total", "Player lookups by outcome",
+    label="outcome", values=("success", "not_found", "http_error", "exception")
+)
+COOLDOWN_REJECTIONS = REGISTRY.counter(
+    "ffbot_cooldown_rejections_total", "Commands rejected by the per-user cooldown"
+)
+QUOTA_REJECTIONS = REGISTRY.counter(
+    "ffbot_quota_rejections_total", "Commands rejected by a guild's daily quota"
+)
+IMAGE_BYTES = REGISTRY.histogram(
+    "ffbot_image_download_bytes", "Size of downloaded images",
+    buckets=(16_384, 65_536, 262_144, 1_048_576, 4_194_304, 8_388_608)
+)
+IMAGE_DOWNLOADS_IN_FLIGHT = REGISTRY.gauge(
+    "ffbot_image_downloads_in_flight", "Image downloads currently streaming"
+)
+IMAGE_REJECTIONS = REGISTRY.counter(
+    "ffbot_image_rejections_total", "Image downloads aborted by validation",
+    label="reason", values=("content_type", "too_large")
+)
+PROCESS_MAX_RSS = REGISTRY.gauge(
+    "ffbot_process_max_rss_bytes", "Peak resident set size of the bot process"
+)
+LOOP_LAG = REGISTRY.gauge(
+    "ffbot_event_loop_lag_seconds", "Most recent event loop lag sample"
+)
+LOOP_LAG_HISTOGRAM = REGISTRY.histogram(
+    "ffbot_event_loop_lag_histogram_seconds", "Distribution of event loop lag samples"
+)
+
+
+async def monitor_loop_lag(interval=0.5):
+    """Sample how late the event loop wakes up from a fixed sleep."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        LOOP_LAG.set(lag)
+        LOOP_LAG_HISTOGRAM.observe(lag)
@@ -0,0 +1,54 @@
+import heapq
+import math
+import time
+
+
+class PopularityTracker:
+    """Exponentially decaying hit counts over a bounded set of keys.
+
+    Instead of decaying every score over time, new hits are weighted by a factor
+    that doubles every ``half_life`` seconds. Relative order is the same, and the
+    scores are rescaled once the factor grows large.
+    """
+
+    RESCALE_AT = 2 ** 32
+
+    def __init__(self, half_life=1800, max_keys=10000):
+        self.half_life = half_life
+        self.max_keys = max_keys
+        self._scores = {}
+        self._epoch = time.monotonic()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def record(self, key, weight=1.0):
+        factor = 2 ** ((time.monotonic() - self._epoch) / self.half_life)
+        if factor > self.RESCALE_AT:
+            self._rescale(factor)
+            factor = 1.0
+        self._scores[key] = self._scores.get(key, 0.0) + weight * factor
+        if len(self._scores) > self.max_keys:
+            self._trim()
+
+    def forget(self, key):
+        """Stop tracking ``key``, e.g. because it no longer resolves."""
+        self._scores.pop(key, None)
+
+    def _rescale(self, factor):
+        self._scores = {key: score / factor for key, score in self._scores.items()}
+        self._epoch = time.monotonic()
+
+    def _trim(self):
+        """Forget the least popular half of the tracked keys."""
+        keep = heapq.nlargest(self.max_keys // 2, self._scores.items(), key=lambda item: item[1])
+        self._scores = dict(keep)
+
+    def top(self, k):
+        """Return the ``k`` most popular keys, most popular first."""
+        return [key for key, _ in heapq.nlargest(k, self._scores.items(), key=lambda item: item[1])]
+
+    def score(self, key):
+        """Current score of ``key`` in hits, decayed to now."""
+        factor = 2 ** ((time.monotonic() - self._epoch) / self.half_life)
+        return self._scores.get(key, 0.0) / factor if not math.isinf(factor) else 0.0
@@ -0,0 +1,100 @@
+import heapq
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class RateLimiter:
+    """Per-user token buckets and per-guild daily quotas behind one O(1) check.
+
+    A bucket that has fully refilled behaves exactly like a missing one, so each
+    bucket is evicted once it is full again. Eviction uses a min-heap of refill
+    times that is drained a few entries per check, which keeps memory bounded
+    by the number of recently active users.
+    """
+
+    PRUNE_PER_CHECK = 32
+
+    def __init__(self, reset_hour=0, burst=1, persist=None):
+        self.reset_hour = reset_hour
+        self.burst = burst
+        self.persist = persist
+        self._buckets = {}  # user_id -> [tokens, updated_at, full_at]
+        self._expiry = []  # heap of (full_at, user_id)
+        self._quotas = {}  # guild_id -> [window, used]
+        self._window = None
+        self._window_ends = 0.0
+
+    def _current_window(self, now):
+        """Return the quota window id and the seconds until it resets."""
+        if now >= self._window_ends:
+            shifted = datetime.fromtimestamp(now, timezone.utc) - timedelta(hours=self.reset_hour)
+            self._window = shifted.date().isoformat()
+            start = datetime.combine(shifted.date(), datetime.min.time(), timezone.utc) + timedelta(hours=self.reset_hour)
+            self._window_ends = (start + timedelta(days=1)).timestamp()
+        return self._window, self._window_ends - now
+
+    def _prune(self, now):
+        for _ in range(self.PRUNE_PER_CHECK):
+            if not self._expiry or self._expiry[0][0] > now:
+                return
+            _, user_id = heapq.heappop(self._expiry)
+            bucket = self._buckets.get(user_id)
+            if bucket is None:
+                continue
+            if bucket[2] > now:
+                heapq.heappush(self._expiry, (bucket[2], user_id))
+            else:
+                del self._buckets[user_id]
+
+    def restore(self, quotas):
+        """Load persisted ``{guild_id: (window, used)}`` counters."""
+        for guild_id, (window, used) in quotas.items():
+            self._quotas[guild_id] = [window, used]
+
+    def quota_used(self, guild_id):
+        window, _ = self._current_window(time.time())
+        quota = self._quotas.get(guild_id)
+        return quota[1] if quota and quota[0] == window else 0
+
+    def check(self, user_id, guild_id, cooldown, daily_limit=None, cost=1):
+        """Charge one command for ``user_id`` and ``cost`` lookups to ``guild_id``.
+
+        Returns ``(allowed, reason, retry_after)`` where reason is ``"cooldown"``
+        or ``"quota"`` when the command is rejected. Pass ``daily_limit=None``
+        for guilds without a quota.
+        """
+        now = time.time()
+        self._prune(now)
+
+        bucket = self._buckets.get(user_id)
+        tokens = self.burst
+        if bucket is not None and cooldown > 0:
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) / cooldown)
+        if tokens < 1:
+            return False, "cooldown", (1 - tokens) * cooldown
+
+        window, resets_in = self._current_window(now)
+        quota = self._quotas.get(guild_id)
+        if quota is None or quota[0] != window:
+            quota = [window, 0]
+        if daily_limit is not None and quota[1] + cost > daily_limit:
+            return False, "quota", resets_in
+
+        if cooldown > 0:
+            tokens -= 1
+            full_at = now + (self.burst - tokens) * cooldown
+            if bucket is None:
+                heapq.heappush(self._expiry, (full_at, user_id))
+            self._buckets[user_id] = [tokens, now, full_at]
+        quota[1] += cost
+        self._quotas[guild_id] = quota
+        if self.persist:
+            self.persist(guild_id, window, quota[1])
+        return True, None, 0.0
+
+    def stats(self):
+        return {
+            "buckets": len(self._buckets),
+            "expiry_heap": len(self._expiry),
+            "guild_quotas": len(self._quotas)
+        }
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because the breaker is open."""
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies used to derive timeouts."""
+
+    def __init__(self, window=200, min_samples=20, multiplier=2.0, floor=1.0, ceiling=10.0):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def record(self, latency):
+        self.samples.append(latency)
+
+    def percentile(self, q):
+        """Return the ``q`` quantile, or None until enough samples are collected."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout(self):
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, p95 * self.multiplier))
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker that lets one probe through after a cool-off."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, failure_threshold=5, recovery_time=30, on_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.on_change = on_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.transitions = deque(maxlen=10)  # (unix time, old state, new state)
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        old, self.state = self.state, state
+        self.transitions.append((time.time(), old, state))
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+        if self.on_change:
+            self.on_change(self, old, state)
+
+    def allow(self):
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_time:
+            self._set_state(self.HALF_OPEN)
+            self.probe_in_flight = False
+        if self.state == self.OPEN:
+            return False
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+        return True
+
+    def release(self):
+        """Give back a half-open probe slot when the probe was cancelled."""
+        self.probe_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self.probe_in_flight = False
+        self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self.probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            self._set_state(self.OPEN)
+            return
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._set_state(self.OPEN)
+
+
+class Attempt:
+    """One try at an upstream call, handed to the ``Upstream`` factory.
+
+    ``timeout`` bounds the attempt's own I/O. ``started_at`` is moved forward
+    once the request holds a connection (see ``utils.http.PoolStats``), so the
+    latency samples leave out the pool wait just as the timeout does.
+    """
+
+    __slots__ = ("timeout", "started_at")
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.started_at = time.monotonic()
+
+
+class Upstream:
+    """Circuit breaker, adaptive timeout and optional hedging around one endpoint.
+
+    ``factory(attempt)`` starts one attempt and must bound its own I/O by
+    ``attempt.timeout`` seconds. Leaving the wait for a pooled connection out of
+    that bound keeps a busy pool from looking like a slow or failing upstream.
+    ``is_failure`` classifies a returned result (for example a 5xx status) as a
+    failure for the breaker without turning it into an exception.
+    """
+
+    def __init__(self, name, floor=1.0, ceiling=10.0, hedge=False, is_failure=None, on_change=None):
+        self.name = name
+        self.hedge = hedge
+        self.is_failure = is_failure
+        self.latency = LatencyTracker(floor=floor, ceiling=ceiling)
+        self.breaker = CircuitBreaker(name, on_change=on_change)
+        self.hedged_calls = 0
+        self.short_circuited = 0
+
+    async def call(self, factory):
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise CircuitOpenError(self.name)
+
+        timeout = self.latency.timeout()
+        try:
+            if self.hedge:
+                result, attempt = await self._hedged(factory, timeout)
+            else:
+                attempt = Attempt(timeout)
+                result = await factory(attempt)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        if self.is_failure and self.is_failure(result):
+            self.breaker.record_failure()
+        else:
+            self.latency.record(time.monotonic() - attempt.started_at)
+            self.breaker.record_success()
+        return result
+
+    async def _hedged(self, factory, timeout):
+        """Start a second attempt if the first is still running after the p95 latency.
+
+        Returns ``(result, attempt)`` for the attempt that answered.
+        """
+        delay = self.latency.percentile(0.95)
+        attempts = {}
+
+        def start():
+            attempt = Attempt(timeout)
+            task = asyncio.ensure_future(factory(attempt))
+            attempts[task] = attempt
+            return task
+
+        first = start()
+        try:
+            if delay is None:
+                return await first, attempts[first]
+            done, _ = await asyncio.wait([first], timeout=delay)
+            if done:
+                return first.result(), attempts[first]
+
+            self.hedged_calls += 1
+            start()
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), attempts[task]
+            return first.result(), attempts[first]
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self):
+        p95 = self.latency.percentile(0.95)
+        return {
+            "state": self.breaker.state,
+            "p95": f"{p95:.3f}s" if p95 is not None else "n/a",
+            "timeout": f"{self.latency.timeout():.2f}s",
+            "hedged": self.hedged_calls,
+            "short_circuited": self.short_circuited
+        }
@@ -0,0 +1,81 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SharedCache:
+    """Lookup cache and cluster stats shared by every bot process through SQLite (WAL).
+
+    Methods block on disk I/O and are meant to be called through ``asyncio.to_thread``.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path, max_age=1200):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS lookup_cache (
+                uid TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                stored_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cluster_stats (
+                cluster_id INTEGER PRIMARY KEY,
+                guilds INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+
+    def get(self, uid):
+        """Return ``(data, age)`` for ``uid`` or None when missing or older than ``max_age``."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload, stored_at FROM lookup_cache WHERE uid = ?", (uid,)).fetchone()
+        if row is None or time.time() - row[1] > self.max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), time.time() - row[1]
+
+    def set(self, uid, data):
+        payload = json.dumps(data, separators=(",", ":"))
+        with self._lock:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO lookup_cache VALUES (?, ?, ?)", (uid, payload, time.time()))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                with self._conn:
+                    self._conn.execute("DELETE FROM lookup_cache WHERE stored_at < ?", (time.time() - self.max_age,))
+
+    def report_guilds(self, cluster_id, guilds):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO cluster_stats VALUES (?, ?, ?)", (cluster_id, guilds, time.time()))
+
+    def total_guilds(self, stale_after=900):
+        """Sum the guild counts reported by clusters within the last ``stale_after`` seconds."""
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(guilds), 0) FROM cluster_stats WHERE updated_at >= ?",
+                (time.time() - stale_after,)
+            ).fetchone()
+        return total
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "writes": self._writes}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
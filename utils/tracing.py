@@ -0,0 +1,162 @@
+"""Per-command traces with timed spans, a slow-request log and sampled profiling.
+
+Log records are handed to a queue and formatted and written by a background
+thread, so logging on the command path costs no I/O or string formatting.
+"""
+import atexit
+import contextvars
+import cProfile
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+import uuid
+
+log = logging.getLogger("ffbot.trace")
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # Formatting is left to the listener thread; arguments logged here are immutable
+        return record
+
+
+class _TraceIdFilter(logging.Filter):
+    """Stamp each record with the trace ID of the command that logged it."""
+
+    def filter(self, record):
+        trace = current_trace.get()
+        record.trace_id = trace.trace_id if trace else "-"
+        return True
+
+
+def setup_logging(level=logging.INFO):
+    """Send all logging through a queue drained by a background thread."""
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s trace=%(trace_id)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(_TraceIdFilter())
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+    listener.start()
+    # Drain whatever is still queued (such as a fatal error) before the process exits
+    atexit.register(listener.stop)
+    return listener
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.trace.spans.append((self.name, self.start - self.trace.start, end - self.start))
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Time a stage of the current trace; a no-op outside of a traced command."""
+    trace = current_trace.get()
+    return trace.span(name) if trace else _NULL_SPAN
+
+
+async def traced(name, awaitable):
+    """Await ``awaitable`` inside a span of the current trace."""
+    with span(name):
+        return await awaitable
+
+
+class Trace:
+    def __init__(self, name, fields):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.fields = fields
+        self.outcome = "rejected"
+        self.start = time.perf_counter()
+        self.spans = []  # (name, offset, duration) in seconds
+        self.profiler = None
+        self._token = None
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def record(self, name, started):
+        """Add a span for a stage that began at ``started`` (a perf_counter value)."""
+        self.spans.append((name, started - self.start, time.perf_counter() - started))
+
+
+class Tracer:
+    """Starts and finishes command traces.
+
+    Traces slower than ``slow_threshold`` seconds are logged with every span at
+    WARNING, the rest at DEBUG. With ``profile_every=N`` roughly one in N traces
+    runs under cProfile and the stats are written to ``profile_dir``. The
+    profiler sees everything the event loop runs meanwhile, not just this command.
+    """
+
+    def __init__(self, slow_threshold=2.0, profile_every=0, profile_dir="profiles"):
+        self.slow_threshold = slow_threshold
+        self.profile_every = profile_every
+        self.profile_dir = profile_dir
+        self._profiling = False
+
+    def start(self, name, **fields):
+        trace = Trace(name, fields)
+        trace._token = current_trace.set(trace)
+        if self.profile_every and not self._profiling and random.random() * self.profile_every < 1:
+            self._profiling = True
+            trace.profiler = cProfile.Profile()
+            trace.profiler.enable()
+        return trace
+
+    def finish(self, trace):
+        total = time.perf_counter() - trace.start
+
+        if trace.profiler:
+            trace.profiler.disable()
+            self._profiling = False
+            path = os.path.join(self.profile_dir, f"{trace.name}-{trace.trace_id}.prof")
+            try:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                trace.profiler.dump_stats(path)
+                log.info("profile written to %s", path)
+            except OSError as e:
+                log.warning("could not write profile: %s", e)
+
+        if total >= self.slow_threshold:
+            log.warning(
+                "slow command=%s outcome=%s total=%.3fs fields=%s spans=%s",
+                trace.name, trace.outcome, total, trace.fields,
+                [(name, round(offset, 4), round(duration, 4)) for name, offset, duration in trace.spans]
+            )
+        else:
+            log.debug(
+                "command=%s outcome=%s total=%.3fs",
+                trace.name, trace.outcome, total
+            )
+        current_trace.reset(trace._token)